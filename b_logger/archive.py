@@ -0,0 +1,443 @@
+"""
+Columnar archive of finished runs for trend analysis
+
+Every run is appended as one segment file: a small json header followed by column blobs.
+String columns (module, name, originalname, status, worker, error signature) are dictionary encoded
+(unique values + uint8/16/32 indices), numeric columns (duration, execution_count) are plain arrays.
+Queries read only the columns they need, so scanning thousands of runs takes seconds.
+
+    archive = RunArchive('../blog_archive')
+    archive.write_run(combined_report)
+    archive.flakiness(last=100)
+    archive.durations(last=100)
+
+CLI:
+    blog-archive runs
+    blog-archive flaky --last 200 --top 20
+    blog-archive durations --last 50 --by originalname
+    blog-archive errors --last 50
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+import uuid
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b'BLOGARC1'
+SEGMENT_SUFFIX = '.blogarc'
+
+STRING_COLUMNS = ('module', 'name', 'originalname', 'status', 'worker', 'error_signature')
+NUMERIC_COLUMNS = {'duration': 'd', 'execution_count': 'I'}
+
+TEXT_COLUMNS = ('test', 'signature', 'segment', 'start_time', 'env', 'results')
+
+FAILED_STATUSES = ('FAILED', 'BROKEN')
+PASSED_STATUSES = ('PASSED',)
+
+_SIGNATURE_PATTERNS = (
+    (re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'), '<uuid>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<addr>'),
+    (re.compile(r'\d+(\.\d+)?'), '<n>'),
+)
+
+
+def error_signature(error: Optional[str], max_length: int = 200) -> str:
+    """First line of the error with numbers, addresses and uuids masked, so equal failures group together"""
+    if not error:
+        return ''
+    signature = str(error).strip().split('\n', 1)[0]
+    for pattern, replacement in _SIGNATURE_PATTERNS:
+        signature = pattern.sub(replacement, signature)
+    return signature[:max_length]
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _index_typecode(dictionary_size: int) -> str:
+    """Smallest unsigned type that fits indices of the dictionary"""
+    if dictionary_size <= 0xFF:
+        return 'B'
+    if dictionary_size <= 0xFFFF:
+        return 'H'
+    return 'I'
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    """Linear interpolation between closest ranks"""
+    if not sorted_values:
+        return math.nan
+    k = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+class ArchivedRun:
+    """Header and requested columns of one segment. String columns are decoded lazily"""
+
+    def __init__(self, path: str, header: dict, columns: dict):
+        self.path = path
+        self.run: dict = header['run']
+        self.rows: int = header['rows']
+        self._columns = columns
+
+    def column(self, name: str) -> list:
+        values = self._columns[name]
+        if isinstance(values, tuple):
+            dictionary, indices = values
+            values = self._columns[name] = [dictionary[i] for i in indices]
+        return values
+
+    def encoded(self, name: str) -> tuple[list[str], array]:
+        """Dictionary and indices of a string column, without materializing values per row"""
+        return self._columns[name]
+
+
+class RunArchive:
+    """
+    Directory of run segments, one `<time>_<ns>_<id>.blogarc` file per run, ordered by name
+
+    Segment layout:
+        MAGIC | uint32 header length | json header | column blobs
+        header = {'run': {...}, 'rows': n, 'columns': {name: {'typecode', 'offset', 'size', ['dict_offset', 'dict_size']}}}
+    Offsets are relative to the end of the header, numbers are little-endian
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    @staticmethod
+    def resolve(archive_dir: str) -> 'RunArchive':
+        """Relative paths are resolved against project root, like b_logs_dir"""
+        path = Path(archive_dir).expanduser()
+        if not path.is_absolute():
+            from b_logger.utils.paths import pathfinder
+            path = pathfinder.project_root() / path
+        return RunArchive(path)
+
+    # ---------------------------------------------------------------- write
+
+    def write_run(self, run_report) -> str:
+        """Appends tests of a combined RunReport as a new segment, returns its path"""
+        rows = self._rows(run_report.iter_test_reports())
+
+        run = {
+            'report_id': getattr(run_report, 'report_id', None),
+            'proj_name': getattr(run_report, 'proj_name', None),
+            'env': getattr(run_report, 'env', None),
+            'start_time': getattr(run_report, 'start_time', None),
+            'end_time': getattr(run_report, 'end_time', None),
+            'duration': getattr(run_report, 'duration', None),
+            'archived_at': round(time.time(), 3)
+        }
+
+        os.makedirs(self.path, exist_ok=True)
+        # nanoseconds keep runs archived within the same second in order
+        name = f'{time.strftime("%Y%m%dT%H%M%S")}_{time.time_ns() % 10 ** 9:09d}_{uuid.uuid4().hex[:8]}{SEGMENT_SUFFIX}'
+        path = self.path / name
+
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(self.encode(run, rows))
+        os.replace(tmp_path, path)
+
+        return str(path)
+
+    @staticmethod
+    def _rows(test_reports: Iterable) -> dict[str, list]:
+        rows = {name: [] for name in (*STRING_COLUMNS, *NUMERIC_COLUMNS)}
+
+        for test in test_reports:
+            get = test.get if isinstance(test, dict) else lambda key, obj=test: getattr(obj, key, None)
+            status = get('status')
+            rows['module'].append(get('module') or '')
+            rows['name'].append(get('name') or '')
+            rows['originalname'].append(get('originalname') or '')
+            rows['status'].append(str(getattr(status, 'value', status) or 'NONE'))
+            rows['worker'].append(get('worker') or '')
+            rows['error_signature'].append(error_signature(get('error')))
+
+            duration = get('duration')
+            rows['duration'].append(float(duration) if duration is not None else math.nan)
+            rows['execution_count'].append(int(get('execution_count') or 0))
+
+        return rows
+
+    @staticmethod
+    def encode(run: dict, rows: dict[str, list]) -> bytes:
+        blobs = []
+        columns = {}
+        offset = 0
+
+        def add_blob(data: bytes) -> tuple[int, int]:
+            nonlocal offset
+            blobs.append(data)
+            offset += len(data)
+            return offset - len(data), len(data)
+
+        for name in STRING_COLUMNS:
+            index = {}
+            codes = [index.setdefault(value, len(index)) for value in rows[name]]
+            typecode = _index_typecode(len(index))
+            dictionary = '\0'.join(value.replace('\0', '') for value in index).encode('utf-8')
+
+            dict_offset, dict_size = add_blob(dictionary)
+            col_offset, col_size = add_blob(_to_le(array(typecode, codes)))
+            columns[name] = {'typecode': typecode, 'offset': col_offset, 'size': col_size,
+                             'dict_offset': dict_offset, 'dict_size': dict_size, 'dict_len': len(index)}
+
+        for name, typecode in NUMERIC_COLUMNS.items():
+            col_offset, col_size = add_blob(_to_le(array(typecode, rows[name])))
+            columns[name] = {'typecode': typecode, 'offset': col_offset, 'size': col_size}
+
+        header = json.dumps({'run': run, 'rows': len(rows['name']), 'columns': columns}).encode('utf-8')
+        return MAGIC + len(header).to_bytes(4, 'little') + header + b''.join(blobs)
+
+    # ---------------------------------------------------------------- read
+
+    def segments(self, last: Optional[int] = None) -> list[Path]:
+        if not self.path.is_dir():
+            return []
+        segments = sorted(p for p in self.path.iterdir() if p.suffix == SEGMENT_SUFFIX)
+        return segments[-last:] if last else segments
+
+    @staticmethod
+    def read_segment(path: str | Path, columns: Optional[Iterable[str]] = None) -> ArchivedRun:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a BLogger archive segment')
+            header_len = int.from_bytes(f.read(4), 'little')
+            header = json.loads(f.read(header_len))
+            base = len(MAGIC) + 4 + header_len
+
+            decoded = {}
+            for name in columns or header['columns']:
+                meta = header['columns'].get(name)
+                if meta is None:
+                    raise KeyError(f'Unknown archive column "{name}"')
+
+                f.seek(base + meta['offset'])
+                values = _from_le(meta['typecode'], f.read(meta['size']))
+
+                if 'dict_offset' in meta:
+                    f.seek(base + meta['dict_offset'])
+                    data = f.read(meta['dict_size']).decode('utf-8')
+                    dictionary = data.split('\0') if meta['dict_len'] else []
+                    decoded[name] = (dictionary, values)
+                else:
+                    decoded[name] = values
+
+        return ArchivedRun(str(path), header, decoded)
+
+    def iter_runs(self, columns: Iterable[str], last: Optional[int] = None) -> Iterator[ArchivedRun]:
+        columns = tuple(columns)
+        for segment in self.segments(last):
+            try:
+                yield self.read_segment(segment, columns)
+            except (OSError, ValueError, KeyError) as e:
+                print(f'[BLogger][WARN] Skipping archive segment {segment}: {e}')
+
+    @staticmethod
+    def _keys(run: ArchivedRun, by: str) -> list[str]:
+        """`module::name` (or originalname) per row, built from dictionaries, not from every row"""
+        modules, module_idx = run.encoded('module')
+        names, name_idx = run.encoded(by)
+        cache = {}
+        keys = []
+        for pair in zip(module_idx, name_idx):
+            key = cache.get(pair)
+            if key is None:
+                key = cache[pair] = f'{modules[pair[0]]}::{names[pair[1]]}'
+            keys.append(key)
+        return keys
+
+    # ---------------------------------------------------------------- queries
+
+    def runs(self, last: Optional[int] = None) -> list[dict]:
+        result = []
+        for run in self.iter_runs(('status',), last):
+            statuses, indices = run.encoded('status')
+            counts = Counter(indices)
+            result.append({
+                **run.run,
+                'segment': os.path.basename(run.path),
+                'tests': run.rows,
+                'results': {statuses[i]: count for i, count in counts.items()}
+            })
+        return result
+
+    def flakiness(self, last: Optional[int] = None, by: str = 'name') -> list[dict]:
+        """
+        Per test over the last runs:
+            flip_rate - share of consecutive runs where the result switched between passed and failed
+            fail_rate - share of runs where the test failed or was broken
+            retried   - runs where the test needed more than one execution
+        Sorted by flip_rate, then fail_rate
+        """
+        stats = defaultdict(lambda: {'runs': 0, 'failed': 0, 'retried': 0, 'flips': 0, 'last': None})
+
+        for run in self.iter_runs(('module', by, 'status', 'execution_count'), last):
+            statuses, status_idx = run.encoded('status')
+            outcome = [True if s in PASSED_STATUSES else False if s in FAILED_STATUSES else None for s in statuses]
+
+            for key, status, executions in zip(self._keys(run, by), status_idx, run.column('execution_count')):
+                test = stats[key]
+                passed = outcome[status]
+                test['runs'] += 1
+                if passed is False:
+                    test['failed'] += 1
+                if executions > 1:
+                    test['retried'] += 1
+                if passed is not None:
+                    if test['last'] is not None and test['last'] != passed:
+                        test['flips'] += 1
+                    test['last'] = passed
+
+        result = []
+        for key, test in stats.items():
+            runs = test['runs']
+            result.append({
+                'test': key,
+                'runs': runs,
+                'failed': test['failed'],
+                'retried': test['retried'],
+                'flips': test['flips'],
+                'flip_rate': round(test['flips'] / (runs - 1), 4) if runs > 1 else 0.0,
+                'fail_rate': round(test['failed'] / runs, 4)
+            })
+
+        result.sort(key=lambda t: (t['flip_rate'], t['fail_rate'], t['retried']), reverse=True)
+        return result
+
+    def durations(self, last: Optional[int] = None, by: str = 'name',
+                  percentiles: Iterable[float] = (50, 90, 95, 99)) -> list[dict]:
+        """Duration percentiles per test, sorted by the highest requested percentile"""
+        percentiles = tuple(percentiles)
+        samples = defaultdict(list)
+
+        for run in self.iter_runs(('module', by, 'duration'), last):
+            for key, duration in zip(self._keys(run, by), run.column('duration')):
+                if not math.isnan(duration):
+                    samples[key].append(duration)
+
+        result = []
+        for key, values in samples.items():
+            values.sort()
+            row = {'test': key, 'runs': len(values), 'mean': round(sum(values) / len(values), 4)}
+            for p in percentiles:
+                row[f'p{p:g}'] = round(_percentile(values, p), 4)
+            result.append(row)
+
+        if percentiles:
+            result.sort(key=lambda t: t[f'p{percentiles[-1]:g}'], reverse=True)
+        return result
+
+    def errors(self, last: Optional[int] = None) -> list[dict]:
+        """Most frequent error signatures and the number of tests they hit"""
+        counts = Counter()
+        tests = defaultdict(set)
+
+        for run in self.iter_runs(('module', 'name', 'error_signature'), last):
+            signatures, signature_idx = run.encoded('error_signature')
+            for key, idx in zip(self._keys(run, 'name'), signature_idx):
+                if signatures[idx]:
+                    counts[signatures[idx]] += 1
+                    tests[signatures[idx]].add(key)
+
+        return [{'signature': signature, 'count': count, 'tests': len(tests[signature])}
+                for signature, count in counts.most_common()]
+
+
+def _print_table(rows: list[dict]):
+    if not rows:
+        print('No data')
+        return
+
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r.get(c, ''))) for r in rows)) for c in columns}
+
+    def line(values: dict) -> str:
+        # text columns are left-aligned, numbers right-aligned
+        return '  '.join(f'{values[c]!s:<{widths[c]}}' if c in TEXT_COLUMNS else f'{values[c]!s:>{widths[c]}}'
+                         for c in columns).rstrip()
+
+    print(line({c: c for c in columns}))
+    for row in rows:
+        print(line(row))
+
+
+def main(argv: Optional[list[str]] = None):
+    arg_parser = argparse.ArgumentParser(prog='blog-archive', description='Trends over archived BLogger runs')
+    arg_parser.add_argument('--dir', default=None, help='Archive directory. Default: archive_dir from blog.config.yaml')
+    arg_parser.add_argument('--json', action='store_true', help='Print result as json')
+
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    for command, help_text in (('runs', 'List archived runs'),
+                               ('flaky', 'Tests that switch between passed and failed'),
+                               ('durations', 'Duration percentiles per test'),
+                               ('errors', 'Most frequent error signatures')):
+        sub = commands.add_parser(command, help=help_text)
+        sub.add_argument('--last', type=int, default=None, help='Only N latest runs')
+        sub.add_argument('--top', type=int, default=20, help='Rows to show, 0 - all')
+        if command in ('flaky', 'durations'):
+            sub.add_argument('--by', choices=['name', 'originalname'], default='name',
+                             help='Group parametrized tests by full name or by function name')
+
+    args = arg_parser.parse_args(argv)
+
+    archive_dir = args.dir
+    if archive_dir is None:
+        from b_logger.config import blog_config
+        archive_dir = blog_config.archive_dir
+        if not archive_dir:
+            arg_parser.error('archive_dir is not set in blog.config.yaml, pass --dir')
+
+    archive = RunArchive.resolve(archive_dir)
+
+    started = time.perf_counter()
+    if args.command == 'runs':
+        rows = archive.runs(args.last)
+    elif args.command == 'flaky':
+        rows = [r for r in archive.flakiness(args.last, args.by) if r['flips'] or r['retried']]
+    elif args.command == 'durations':
+        rows = archive.durations(args.last, args.by)
+    else:
+        rows = archive.errors(args.last)
+    elapsed = time.perf_counter() - started
+
+    if args.top:
+        rows = rows[-args.top:] if args.command == 'runs' else rows[:args.top]
+
+    if args.json:
+        print(json.dumps(rows, indent=2, default=str))
+    else:
+        if args.command == 'runs':
+            rows = [{k: r[k] for k in ('start_time', 'env', 'tests', 'results', 'segment')} for r in rows]
+        _print_table(rows)
+        print(f'\n{len(archive.segments(args.last))} runs scanned in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
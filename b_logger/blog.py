@@ -14,11 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import inspect
 import pytest
 
+from functools import wraps
 from pathlib import Path
 from typing import Union, BinaryIO, Optional, Any
-from contextlib import contextmanager
+from contextlib import ContextDecorator, ExitStack
 
 from b_logger.entities.steps import Step
 from b_logger.entities.exceptions import possible_exceptions
@@ -26,6 +28,61 @@ from b_logger.integrations import Integrations
 from b_logger.plugin import runtime
 
 
+class StepContext(ContextDecorator):
+    """blog.step: `with`, `async with` and a decorator of sync and async functions"""
+
+    def __init__(self, title: str, expected: Optional[str] = None):
+        self.title = title
+        self.expected = expected
+
+    def _recreate_cm(self):
+        return StepContext(self.title, self.expected)
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def inner(*args, **kwargs):
+                async with self._recreate_cm():
+                    return await func(*args, **kwargs)
+            return inner
+
+        return super().__call__(func)
+
+    def __enter__(self):
+        self._integrations = ExitStack()
+        self._integrations.enter_context(Integrations.step(self.title, self.expected))
+
+        self.step = Step(title=self.title, expected=self.expected)
+        runtime.start_step(self.step)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc is None:
+                runtime.handle_step_result(self.step)
+            elif isinstance(exc, possible_exceptions):
+                runtime.handle_step_result(self.step, exc)
+        finally:
+            runtime.finish_step(self.step)
+
+        return self._integrations.__exit__(exc_type, exc, tb)
+
+    async def __aenter__(self):
+        self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await runtime.wait_screenshots_async()
+
+            if exc is None:
+                runtime.handle_step_result(self.step)
+            elif isinstance(exc, possible_exceptions):
+                await runtime.handle_step_result_async(self.step, exc)
+        finally:
+            runtime.finish_step(self.step)
+
+        return self._integrations.__exit__(exc_type, exc, tb)
+
+
 class BLogger:
 
     @staticmethod
@@ -181,8 +238,7 @@ class BLogger:
         return pytest.mark.blog_known_bug(url=url, description=description)
 
     @staticmethod
-    @contextmanager
-    def step(title: str, expected: Optional[str] = None):
+    def step(title: str, expected: Optional[str] = None) -> 'StepContext':
         """
         Wrap a code block into a step.
         Will be displayed in Setup, Steps and Teardown blocks depending on a test stage.
@@ -192,23 +248,14 @@ class BLogger:
         Usage:
             with blog.step('Step Title', 'Expected Result'):
                 ...
-        """
-        with Integrations.step(title, expected):
-
-            step = Step(title=title, expected=expected)
 
-            runtime.start_step(step)
-
-            try:
-                yield
-                runtime.handle_step_result(step)
-
-            except possible_exceptions as e:
-                runtime.handle_step_result(step, e)
-                raise e
+            async with blog.step('Step Title'):  # async tests, the error screenshot doesn't block the event loop
+                ...
 
-            finally:
-                runtime.finish_step(step)
+            @blog.step('Step Title')
+            def some_step(): ...
+        """
+        return StepContext(title, expected)
 
     @staticmethod
     def print(data: Any):
@@ -238,8 +285,11 @@ class BLogger:
         Usage:
             blog.screenshot('scr_name')
             blog.screenshot('err_scr_name', True)
+
+        In async tests it can be awaited, async Playwright pages are captured without blocking the event loop:
+            await blog.screenshot('scr_name')
         """
-        runtime.make_screenshot(name, is_error)
+        return runtime.make_screenshot(name, is_error)
 
     @staticmethod
     def attach(content: Union[bytes, Path, BinaryIO, str, dict, list, int, float, bool, None], name: Optional[str] = None):
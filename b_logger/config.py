@@ -23,18 +23,22 @@ class BLoggerConfig:
 
     def __init__(
         self,
-        config_path: str = f"{pathfinder.project_root()}/blog.config.yaml",
-        notes_path: str = f"{pathfinder.project_root()}/blog.notes.yaml",
+        config_path: str = None,
+        notes_path: str = None,
     ):
         if self._initialized:
             return
 
+        config_path = config_path or f"{pathfinder.project_root()}/blog.config.yaml"
+        notes_path = notes_path or f"{pathfinder.project_root()}/blog.notes.yaml"
+
         self._data = self._load_config_file(config_path)
 
         # blog.config.yaml
         self.project_name: Optional[str] = self._data.get("project_name")
         self.env: Optional[str] = self._data.get("env", None)
         self.base_url: Optional[str] = self._data.get("base_url", None)
+        self.b_logs_dir: Optional[str] = self._data.get("b_logs_dir", None)
 
         tz_value = self._data.get("tz", "UTC")
         self.tz: Optional[ZoneInfo] = self._process_tz(tz_value)
@@ -45,6 +49,35 @@ class BLoggerConfig:
 
         self.hide_passwords: bool = bool(self._data.get("hide_passwords", True))
 
+        self.journal: bool = bool(self._data.get("journal", False))
+        self.journal_fsync_every: int = int(self._data.get("journal_fsync_every", 50))
+        self.spill_reports: bool = bool(self._data.get("spill_reports", False))
+
+        self.async_attachments: bool = bool(self._data.get("async_attachments", False))
+        self.attachment_workers: int = int(self._data.get("attachment_workers", 2))
+        self.attachment_queue_size: int = int(self._data.get("attachment_queue_size", 64))
+        self.attachments_dedup: bool = bool(self._data.get("attachments_dedup", False))
+        self.attachments_strategy: str = self._process_attachments_strategy(self._data.get("attachments_strategy", "copy"))
+
+        self.report_mode: str = self._process_report_mode(self._data.get("report_mode", "full"))
+        self.merge_workers: int = int(self._data.get("merge_workers", 1))
+        self.steps_compression: str = self._process_steps_compression(self._data.get("steps_compression", "none"))
+        self.json_backend: str = self._data.get("json_backend", "auto")
+        self.live_report: bool = bool(self._data.get("live_report", False))
+        self.archive_dir: Optional[str] = self._data.get("archive_dir", None)
+        self.duration_scheduling: bool = bool(self._data.get("duration_scheduling", False))
+        self.duration_history: str = self._data.get("duration_history", ".blog_durations.json")
+
+        self.screenshot_format: str = self._process_screenshot_format(self._data.get("screenshot_format", "png"))
+        self.screenshot_quality: int = int(self._data.get("screenshot_quality", 80))
+        self.screenshot_max_size: int = int(self._data.get("screenshot_max_size", 0))
+        self.screenshots_per_test: int = int(self._data.get("screenshots_per_test", 0))
+        self.screenshots_per_session: int = int(self._data.get("screenshots_per_session", 0))
+        self.screenshot_dedup: bool = bool(self._data.get("screenshot_dedup", False))
+        self.screenshot_dedup_distance: int = int(self._data.get("screenshot_dedup_distance", 4))
+        self.screenshot_max_total_mb: float = float(self._data.get("screenshot_max_total_mb", 0))
+        self.profile: bool = bool(self._data.get("profile", False))
+
         # blog.notes.yaml
         self.notes: dict = self._load_notes_file(notes_path) or {}
 
@@ -79,6 +112,40 @@ class BLoggerConfig:
                 f'Set a valid IANA timezone (e.g. "UTC", "Europe/Moscow", "America/New_York").'
             ) from e
 
+    @staticmethod
+    def _process_attachments_strategy(value):
+        strategies = ('copy', 'hardlink', 'reflink', 'reference')
+        if value not in strategies:
+            print(f'[BLogger][WARN] Unknown attachments_strategy "{value}", "copy" is used. Available: {strategies}')
+            return 'copy'
+        return value
+
+    @staticmethod
+    def _process_report_mode(value):
+        modes = ('full', 'lazy')
+        if value not in modes:
+            print(f'[BLogger][WARN] Unknown report_mode "{value}", "full" is used. Available: {modes}')
+            return 'full'
+        return value
+
+    @staticmethod
+    def _process_steps_compression(value):
+        codecs = ('none', 'gzip', 'zstd')
+        value = 'none' if value in (None, False) else value
+        if value not in codecs:
+            print(f'[BLogger][WARN] Unknown steps_compression "{value}", "none" is used. Available: {codecs}')
+            return 'none'
+        return value
+
+    @staticmethod
+    def _process_screenshot_format(value):
+        formats = ('png', 'webp', 'jpeg')
+        value = 'jpeg' if value == 'jpg' else value
+        if value not in formats:
+            print(f'[BLogger][WARN] Unknown screenshot_format "{value}", "png" is used. Available: {formats}')
+            return 'png'
+        return value
+
     def apply_cli_options(self, config):
         for opt_name in config.option.__dict__:
             if opt_name.startswith("blog_"):
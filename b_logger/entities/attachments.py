@@ -1,20 +1,31 @@
+import os
 import re
 import shutil
+import hashlib
 import uuid
 import mimetypes
 import json
 from pathlib import Path
-from typing import Union, Optional, BinaryIO
+from typing import Union, Optional, BinaryIO, Callable
 
+from b_logger.config import blog_config
+from b_logger.utils.attachment_writer import attachment_writer
 from b_logger.utils.basedatamodel import BaseDataModel
+from b_logger.utils.file_ops import same_filesystem, hardlink, reflink, copy_file, stream_copy
+from b_logger.utils.ids import next_id
 from b_logger.utils.json_handler import process_json
-from b_logger.utils.paths import attachments_path
+from b_logger.utils.paths import attachments_path, b_logs_path
 
 
 class Attachment(BaseDataModel):
     """Handles attachment saving, type detection, naming, and serialization."""
 
-    root = Path(attachments_path())
+    __slots__ = ('name', 'type_', 'digest', 'source', 'strategy', 'size')
+
+    blobs_dir = 'blobs'
+    chunk_size = 1024 * 1024
+
+    _stored_blobs: set[str] = set()
 
     def __init__(
         self,
@@ -23,8 +34,12 @@ class Attachment(BaseDataModel):
         type_: Optional[str] = None,
         _skip_processing: bool = False,
     ):
-        self.name = self._sanitize_name(name or f'attachment_{uuid.uuid4()}')
+        self.name = self._sanitize_name(name or next_id('attachment'))
         self.type_ = type_
+        self.digest: Optional[str] = None
+        self.source: Optional[str] = None
+        self.strategy: Optional[str] = None
+        self.size: Optional[int] = None
 
         if not _skip_processing:
             self._process(content)
@@ -91,18 +106,29 @@ class Attachment(BaseDataModel):
         self._ensure_extension(ext)
         self.type_ = self.type_ or mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
 
+        if blog_config.attachments_strategy == 'reference':
+            self.source = str(path.resolve())
+            self._set_transfer('reference', 0)
+            return
+
+        if blog_config.attachments_dedup:
+            self._store_blob_from_path(path)
+            return
+
         dest = self._unique_path(self.name)
-        shutil.copyfile(path, dest)
-        self.name = dest.name
+        self._transfer_file(path, dest)
 
     def _process_filelike(self, file_obj: BinaryIO):
         guessed_ext = Path(getattr(file_obj, 'name', '')).suffix or '.bin'
         self.type_ = mimetypes.guess_type(getattr(file_obj, 'name', ''))[0] or 'application/octet-stream'
         self._ensure_extension(guessed_ext)
-        data = file_obj.read()
-        if isinstance(data, str):
-            data = data.encode('utf-8')
-        self._save_from_bytes(data)
+
+        if blog_config.attachments_dedup:
+            self._store_blob_from_stream(file_obj)
+            return
+
+        dest = self._unique_path(self.name)
+        self._set_transfer('stream', stream_copy(file_obj, dest))
 
     # ---------------------------------------------------------------------
     # SAVE METHODS
@@ -111,28 +137,205 @@ class Attachment(BaseDataModel):
         dest = self._unique_path(self.name)
         shutil.copy2(file_path, dest)
 
-    def _save_from_bytes(self, data: bytes):
+    def _save_from_bytes(self, data: bytes, encode: Optional[Callable[[bytes], bytes]] = None):
         if isinstance(data, Path):
             print('[BLogger][WARN] Invalid call: _save_from_bytes received a Path object')
 
+        if blog_config.attachments_dedup:
+            self._store_blob(data, encode)
+            return
+
         dest = self._unique_path(self.name)
+        attachment_writer.submit(self._write_bytes, dest, data, encode, size=len(data), background=encode is not None)
+
+    @staticmethod
+    def _write_bytes(dest: Path, data: bytes, encode: Optional[Callable[[bytes], bytes]] = None):
+        if encode is not None:
+            data = encode(data)
         with open(dest, 'wb') as f:
             f.write(data)
 
+    @classmethod
+    def from_encoded_bytes(cls, data: bytes, name: Optional[str], type_: str, ext: str,
+                           encode: Callable[[bytes], bytes]) -> 'Attachment':
+        """`encode` is applied on the attachment writer pool right before the write, not on the test thread"""
+        attachment = cls(name=name, type_=type_, _skip_processing=True)
+        attachment._ensure_extension(ext)
+        attachment._save_from_bytes(data, encode)
+        return attachment
+
+    @classmethod
+    def duplicate_of(cls, attachment: 'Attachment') -> 'Attachment':
+        """Entry pointing to the file of an earlier attachment, nothing is written"""
+        duplicate = cls(name=attachment.name, type_=attachment.type_, _skip_processing=True)
+        duplicate.digest = attachment.digest
+        duplicate.source = attachment.source
+        duplicate._set_transfer('duplicate', 0)
+        return duplicate
+
+    # ---------------------------------------------------------------------
+    # CONTENT-ADDRESSED STORE
+    # ---------------------------------------------------------------------
+    def _store_blob(self, data: bytes, encode: Optional[Callable[[bytes], bytes]] = None):
+        """Stores bytes once under their digest (of the original bytes, before `encode`). Display name is kept as is."""
+        self.digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        blob = self._blob_path()
+
+        if self._claim_blob(blob):
+            attachment_writer.submit(self._write_blob, blob, data, encode, size=len(data),
+                                     background=encode is not None)
+
+    def _store_blob_from_path(self, path: Path):
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                hasher.update(chunk)
+
+        self.digest = hasher.hexdigest()
+        blob = self._blob_path()
+
+        if self._claim_blob(blob):
+            self._transfer_file(path, blob, blob=True)
+        else:
+            self._set_transfer('dedup', 0)
+
+    def _store_blob_from_stream(self, file_obj: BinaryIO):
+        blobs = self._root() / self.blobs_dir
+        blobs.mkdir(parents=True, exist_ok=True)
+
+        hasher = hashlib.blake2b(digest_size=16)
+        tmp = blobs / f'{uuid.uuid4()}.tmp'
+        size = stream_copy(file_obj, tmp, on_chunk=hasher.update)
+
+        self.digest = hasher.hexdigest()
+        blob = self._blob_path()
+
+        if self._claim_blob(blob):
+            os.replace(tmp, blob)
+            self._set_transfer('stream', size)
+        else:
+            tmp.unlink()
+            self._set_transfer('dedup', 0)
+
+    @staticmethod
+    def _root() -> Path:
+        # resolved on use: b_logs location is known only after pytest_configure
+        return Path(attachments_path())
+
+    def _blob_path(self) -> Path:
+        return self._root() / self.blobs_dir / f'{self.digest}{Path(self.name).suffix.lower()}'
+
+    @classmethod
+    def forget_blobs(cls):
+        """Called at session start: blobs written by a previous session in this process may be gone with its b_logs"""
+        cls._stored_blobs.clear()
+
+    @classmethod
+    def _claim_blob(cls, blob: Path) -> bool:
+        """True if the blob still has to be written by this process"""
+        if blob.name in cls._stored_blobs:
+            return False
+
+        cls._stored_blobs.add(blob.name)
+
+        if blob.exists():
+            return False
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        return True
+
+    @staticmethod
+    def _write_blob(blob: Path, data: bytes, encode: Optional[Callable[[bytes], bytes]] = None):
+        if encode is not None:
+            data = encode(data)
+        tmp = blob.with_name(f'{blob.name}.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, blob)
+
+    @staticmethod
+    def _copy_blob(src: Path, blob: Path):
+        tmp = blob.with_name(f'{blob.name}.{os.getpid()}.tmp')
+        copy_file(src, tmp)
+        os.replace(tmp, blob)
+
+    # ---------------------------------------------------------------------
+    # FILE TRANSFER STRATEGIES
+    # ---------------------------------------------------------------------
+    def _transfer_file(self, src: Path, dest: Path, blob: bool = False):
+        """
+        Places src at dest according to attachments_strategy:
+            hardlink - link when on the same filesystem, else falls back to reflink/copy
+            reflink  - copy-on-write clone where supported, else falls back to copy
+            copy     - copy_file_range/regular copy, done by the attachment writer
+
+        Blobs are never hardlinked: an edit of the user's file would change every attachment of the digest
+        """
+        strategy = blog_config.attachments_strategy
+
+        if strategy == 'hardlink' and not blob and same_filesystem(src, dest.parent) and hardlink(src, dest):
+            self._set_transfer('hardlink', 0)
+            return
+
+        if strategy in ('hardlink', 'reflink') and reflink(src, dest):
+            self._set_transfer('reflink', 0)
+            return
+
+        size = src.stat().st_size
+        self._set_transfer('copy', size)
+        attachment_writer.submit(self._copy_blob if blob else copy_file, src, dest, size=size)
+
+    def _set_transfer(self, strategy: str, size: int):
+        self.strategy = strategy
+        self.size = size
+
+    # ---------------------------------------------------------------------
+    # REPORT PATHS
+    # ---------------------------------------------------------------------
+    @classmethod
+    def resolve_path(cls, attachment) -> str:
+        """Link to the attachment file relative to b_logs dir. Accepts Attachment or its dict"""
+        data = attachment if isinstance(attachment, dict) else attachment.to_dict()
+        name = data.get('name') or ''
+
+        if data.get('source'):
+            try:
+                return Path(os.path.relpath(data['source'], b_logs_path())).as_posix()
+            except ValueError:
+                return Path(data['source']).as_uri()
+
+        if data.get('digest'):
+            return f'attachments/{cls.blobs_dir}/{data["digest"]}{Path(name).suffix.lower()}'
+
+        return f'attachments/{name}'
+
+    @classmethod
+    def _file_path(cls, data: dict) -> Path:
+        if data.get('source'):
+            return Path(data['source'])
+        return Path(b_logs_path()) / cls.resolve_path(data)
+
     # ---------------------------------------------------------------------
     # UTILITIES
     # ---------------------------------------------------------------------
     def _unique_path(self, filename: str) -> Path:
-        """Returns a unique path (adds _1, _2, etc. if name already exists)."""
+        """
+        Reserves a unique path (adds _1, _2, etc. if name already exists).
+        The file is created empty right away, so the name stays taken while its content is written in background.
+        """
         base = Path(filename).stem
         ext = Path(filename).suffix
-        dest = self.root / filename
+        dest = self._root() / filename
+        dest.parent.mkdir(parents=True, exist_ok=True)
         index = 1
-        while dest.exists():
-            dest = self.root / f'{base}_{index}{ext}'
-            index += 1
+        while True:
+            try:
+                os.close(os.open(dest, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+                break
+            except FileExistsError:
+                dest = self._root() / f'{base}_{index}{ext}'
+                index += 1
         self.name = dest.name
-        dest.parent.mkdir(parents=True, exist_ok=True)
         return dest
 
     def _ensure_extension(self, ext: str):
@@ -157,14 +360,24 @@ class Attachment(BaseDataModel):
         if not name:
             print(f'[BLogger][WARN] Missing "name" field in attachment dictionary')
 
-        path = cls.root / name
+        path = cls._file_path(data)
         if not path.exists():
             print(f'[BLogger][WARN] Attachment file not found: {path}')
 
-        return cls(path, name=name, type_=type_, _skip_processing=True)
+        attachment = cls(path, name=name, type_=type_, _skip_processing=True)
+        attachment.digest = data.get("digest")
+        attachment.source = data.get("source")
+        attachment.strategy = data.get("strategy")
+        attachment.size = data.get("size")
+        return attachment
 
     def to_dict(self) -> dict:
-        return {"name": self.name, "type_": self.type_}
+        data = {"name": self.name, "type_": self.type_}
+        for key in ('digest', 'source', 'strategy', 'size'):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        return data
 
     def __repr__(self):
         return f"<Attachment name={self.name!r}, type={self.type_!r}>"
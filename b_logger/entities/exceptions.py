@@ -1,6 +1,2 @@
-try:
-    from selenium.common import WebDriverException
-except ImportError:
-    WebDriverException = Exception
-
-possible_exceptions = (Exception, WebDriverException)
+# selenium WebDriverException is an Exception subclass, importing selenium just to list it is not needed
+possible_exceptions = (Exception,)
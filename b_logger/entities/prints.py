@@ -1,11 +1,12 @@
-import uuid
-
 from b_logger.utils.basedatamodel import BaseDataModel
+from b_logger.utils.ids import next_id
 
 
 class Print(BaseDataModel):
+    __slots__ = ('id', 'title', 'parent_id')
+
     def __init__(self, data):
-        self.id = f'print_{uuid.uuid4()}'
+        self.id = next_id('print')
         self.title = data
         self.parent_id = None
 
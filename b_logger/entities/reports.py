@@ -1,15 +1,14 @@
 import uuid
 from collections import defaultdict
 from datetime import datetime
-from dateutil import parser
-from filelock import FileLock
+from typing import NamedTuple
 
 from b_logger.config import blog_config
 from b_logger.entities.statuses import TestStatus
 from b_logger.entities.tests import TestReport
-from b_logger.entities.steps import StepContainer
 from b_logger.utils.basedatamodel import BaseDataModel
-from b_logger.utils.paths import b_logs_tmp_steps_path, b_logs_tmp_reports_path
+from b_logger.utils.journal import ReportJournal
+from b_logger.utils.paths import b_logs_tmp_reports_path
 
 
 class RunResults(BaseDataModel):
@@ -26,6 +25,24 @@ class RunResults(BaseDataModel):
         current = getattr(self, result)
         setattr(self, result, current + amount)
 
+    def items(self):
+        return self.__dict__.items()
+
+
+class TestIndex(NamedTuple):
+    """What spill mode keeps in memory for a finished test, the TestReport itself is in the journal at `offset`"""
+    name: str
+    status: str
+    offset: int
+
+
+def _new_module() -> dict:
+    # module level (not lambda), so RunReport can be pickled to/from merge processes
+    return {
+        "results": RunResults(),
+        "tests": defaultdict(list)
+    }
+
 
 class RunReport(BaseDataModel):
     def __init__(self):
@@ -40,12 +57,13 @@ class RunReport(BaseDataModel):
         self.duration = None
         self.report_ids = {}
         self.run_results = RunResults()
-        self.modules: dict[str, dict] = defaultdict(
-            lambda: {
-                "results": RunResults(),
-                "tests": defaultdict(list)
-            }
-        )
+        self.modules: dict[str, dict] = self._new_modules()
+        self.scheduling: dict | None = None
+        self.overhead: dict | None = None
+
+    @staticmethod
+    def _new_modules() -> dict[str, dict]:
+        return defaultdict(_new_module)
 
     def apply_config(self):
         self.proj_name = blog_config.project_name
@@ -62,6 +80,12 @@ class RunReport(BaseDataModel):
     def set_worker(self, worker):
         self.worker = worker
 
+    def set_scheduling(self, scheduling: dict | None):
+        self.scheduling = scheduling
+
+    def set_overhead(self, overhead: dict | None):
+        self.overhead = overhead
+
     def set_end_time(self):
         self.end_time = datetime.now(tz=blog_config.tz).strftime('%Y-%m-%d %H:%M:%S %Z')
 
@@ -70,17 +94,19 @@ class RunReport(BaseDataModel):
             start_time = self.get_iso_start_time()
             end_time = self.get_iso_end_time()
 
-            self.duration = end_time - start_time
+            self.duration = str(end_time - start_time)
         else:
-            self.duration = self.end_time - self.start_time
+            self.duration = str(self.end_time - self.start_time)
 
     def get_iso_start_time(self):
         if isinstance(self.start_time, str):
+            from dateutil import parser
             return parser.parse(self.start_time, ignoretz=True)
         return self.start_time
 
     def get_iso_end_time(self):
         if isinstance(self.end_time, str):
+            from dateutil import parser
             return parser.parse(self.end_time, ignoretz=True)
         return self.end_time
 
@@ -94,25 +120,49 @@ class RunReport(BaseDataModel):
         self.modules[module]['results'].increase(status)
         self.run_results.increase(status)
 
-    def get_steps(self) -> dict:
-        steps_by_id = {}
+    def add_test_index(self, test_report: TestReport, offset: int):
+        module = test_report.module
+        test_name = test_report.originalname
+        status = test_report.status
+
+        self.modules[module]['tests'][test_name].append(TestIndex(test_report.name, status, offset))
+
+        self.modules[module]['results'].increase(status)
+        self.run_results.increase(status)
+
+    def add_test_record(self, record: dict):
+        module = record.get('module')
+        test_name = record.get('originalname')
+        status = record.get('status') or TestStatus.NONE
+
+        self.modules[module]['tests'][test_name].append(record)
+
+        self.modules[module]['results'].increase(status)
+        self.run_results.increase(status)
+
+    def load_journal(self, path: str):
+        """Rebuild modules and results from the worker journal, which is the source of truth in journal mode"""
+        self.modules = self._new_modules()
+        self.run_results = RunResults()
+
+        for record in ReportJournal.read(path):
+            self.add_test_record(record)
+
+    def journal_path(self) -> str:
+        return ReportJournal.path_for(f'{b_logs_tmp_reports_path()}/{self.report_id}')
+
+    def iter_test_reports(self):
         if self.modules:
             for module_data in self.modules.values():
                 for test_name, test_reports in module_data['tests'].items():
-                    for report in test_reports:
-                        step_attempts = report.get('steps')
-                        if step_attempts:
-                            for attempt_id in step_attempts:
-                                path = f'{b_logs_tmp_steps_path()}/{attempt_id}.json'
-                                try:
-                                    steps_by_id[attempt_id] = StepContainer.from_json(path)
-                                except FileNotFoundError:
-                                    continue
-        return steps_by_id
+                    yield from test_reports
 
     def combine_modules_from_report(self, run_report):
-        if run_report.modules:
-            for module_name, module_data in run_report.modules.items():
+        self.combine_modules(run_report.modules)
+
+    def combine_modules(self, modules: dict | None):
+        if modules:
+            for module_name, module_data in modules.items():
                 mod_results = module_data["results"]
                 mod_tests: dict = module_data["tests"]
 
@@ -124,14 +174,17 @@ class RunReport(BaseDataModel):
                 for test_name, test_reports in mod_tests.items():
                     module['tests'][test_name].extend(test_reports)
 
+    def combine_run_results(self, run_results):
+        for status, count in run_results.items():
+            self.run_results.increase(status, count)
+
     def save_json(self, file_name=None):
         root = f'{b_logs_tmp_reports_path()}'
         if file_name:
             path = f'{root}/{file_name}'
         else:
             path = f'{root}/{self.report_id}'
-        with FileLock(f'{path}.lock'):
-            self.to_json_file(path)
+        self.to_json_file(path)
 
     # def get_modules(self):
     #     return self.modules.keys()
@@ -3,13 +3,13 @@ import traceback
 from contextlib import contextmanager, ContextDecorator
 import uuid
 from enum import Enum
-from filelock import FileLock
 
 from b_logger.entities.attachments import Attachment
 from b_logger.entities.prints import Print
-from b_logger.utils.paths import b_logs_tmp_path, b_logs_tmp_steps_path
+from b_logger.utils.paths import b_logs_tmp_path
 from b_logger.utils.basedatamodel import BaseDataModel
 from b_logger.utils.formatters import format_exc, format_tb
+from b_logger.utils.ids import next_id
 
 
 class StepStatus(str, Enum):
@@ -30,18 +30,23 @@ class StepStatus(str, Enum):
 
 
 class StepError(BaseDataModel):
+    __slots__ = ('exc', 'tb')
+
     def __init__(self, exc, tb=None):
         self.exc = format_exc(exc)
         self.tb = format_tb(tb) or format_tb(traceback.format_exc(4))
 
 
 class Step(BaseDataModel):
+    __slots__ = ('id', 'title', 'status', 'expected', 'parent_id', 'start_time', 'duration',
+                 'error', 'info', 'attachments', 'known_bugs', 'steps')
+
     def __init__(self,
                  title: str = None,
                  status: StepStatus = None,
                  expected: str = None
                  ):
-        self.id = f'step_{uuid.uuid4()}'
+        self.id = next_id('step')
         self.title = title
         self.status = status
         self.expected = expected
@@ -49,10 +54,11 @@ class Step(BaseDataModel):
         self.start_time = time.time()
         self.duration = None
         self.error: StepError | None = None
-        self.info = {}
-        self.attachments = []
-        self.known_bugs = []
-        self.steps = []
+        # containers are created on first write, most steps never get any
+        self.info: dict | None = None
+        self.attachments: list | None = None
+        self.known_bugs: list | None = None
+        self.steps: list | None = None
 
     def set_status(self, status: StepStatus):
         self.status = status
@@ -67,9 +73,13 @@ class Step(BaseDataModel):
         self.duration = round(time.time() - self.start_time, 2)
 
     def add_sub_step(self, step):
+        if self.steps is None:
+            self.steps = []
         self.steps.append(step)
 
     def add_info(self, info: dict):
+        if self.info is None:
+            self.info = {}
         for key, value in info.items():
             if key in self.info:
                 existing = self.info[key]
@@ -80,12 +90,18 @@ class Step(BaseDataModel):
                 self.info[key] = value
 
     def add_attachment(self, attachment: Attachment):
+        if self.attachments is None:
+            self.attachments = []
         self.attachments.append(attachment)
 
     def add_known_bug(self, bug):
+        if self.known_bugs is None:
+            self.known_bugs = []
         self.known_bugs.append(bug)
 
     def add_links(self, links: dict):
+        if self.info is None:
+            self.info = {}
         existing_links = self.info.get('links', {})
         if existing_links:
             for key, value in links.items():
@@ -106,15 +122,29 @@ class StepContainer(BaseDataModel, dict):
     def __init__(self):
         super().__init__()
         self.container_id = f'steps_{uuid.uuid4()}'
-        self.current_step_id = None
         self.failed = False
         self.current_stage = 'setup'
+        self._steps_index: dict[str, Step] = {}
+        self._steps_stack: list[Step] = []
         self['setup'] = []
         self['call'] = []
         self['teardown'] = []
 
-    def set_current_step(self, step_id):
-        self.current_step_id = step_id
+    @property
+    def current_step_id(self) -> str | None:
+        return self._steps_stack[-1].id if self._steps_stack else None
+
+    def push_step(self, step: Step):
+        self._steps_index[step.id] = step
+        self._steps_stack.append(step)
+
+    def pop_step(self, step: Step):
+        if step not in self._steps_stack:
+            return
+
+        while self._steps_stack:
+            if self._steps_stack.pop() is step:
+                break
 
     def add_step(self, step: Step | Print):
         cur_stg = self.get(self.current_stage)
@@ -124,9 +154,12 @@ class StepContainer(BaseDataModel, dict):
         return self.get('setup', []) + self.get('call', []) + self.get('teardown', [])
 
     def get_current_step(self) -> Step | None:
-        return self.get_step_by_id(self.current_step_id)
+        return self._steps_stack[-1] if self._steps_stack else None
 
     def get_step_by_id(self, step_id: str) -> Step | None:
+        if step_id in self._steps_index:
+            return self._steps_index[step_id]
+
         for step in self.get_all_steps():
             found = self._recursive_search(step, step_id)
             if found:
@@ -148,11 +181,10 @@ class StepContainer(BaseDataModel, dict):
 
         return None
 
-    def save_json(self, file_name=None):
-        root = f'{b_logs_tmp_steps_path()}'
-        if file_name:
-            path = f'{root}/{file_name}'
-        else:
-            path = f'{root}/{self.container_id}'
-        with FileLock(f'{path}.lock'):
-            self.to_json_file(path)
+    @classmethod
+    def from_segment(cls, path: str, offset: int):
+        """Container written by StepsWriter at `offset` of a packed steps file"""
+        from b_logger.utils.steps_store import StepsSegment
+
+        with StepsSegment(path) as segment:
+            return cls.from_dict(segment.read(offset))
@@ -6,6 +6,9 @@ from b_logger.utils.basedatamodel import BaseDataModel
 
 
 class TestReport(BaseDataModel):
+    __slots__ = ('module', 'name', 'originalname', 'status', 'execution_count', 'start_time', 'duration',
+                 'description', 'info', 'attachments', 'known_bugs', 'steps', 'error', 'stacktrace', 'worker', 'nodeid')
+
     def __init__(self, module: str = None, name: str = None, originalname: str = None):
         self.module: str = module
         self.name: str = name
@@ -15,12 +18,15 @@ class TestReport(BaseDataModel):
         self.start_time = round(time.time(), 4)
         self.duration: float | None = None
         self.description: str | None = None
-        self.info = {}
-        self.attachments = []
-        self.known_bugs = []
-        self.steps = []
+        # containers are created on first write
+        self.info: dict | None = None
+        self.attachments: list | None = None
+        self.known_bugs: list | None = None
+        self.steps: list | None = None
         self.error = None
         self.stacktrace = None
+        self.worker: str | None = None
+        self.nodeid: str | None = None
 
     def set_status(self, status: TestStatus):
         self.status = status
@@ -34,6 +40,12 @@ class TestReport(BaseDataModel):
     def set_stacktrace(self, stacktrace: str):
         self.stacktrace = stacktrace
 
+    def set_worker(self, worker: str):
+        self.worker = worker
+
+    def set_nodeid(self, nodeid: str):
+        self.nodeid = nodeid
+
     def set_description(self, description: str):
         self.description = description
 
@@ -41,6 +53,8 @@ class TestReport(BaseDataModel):
         self.description += f'\n\n{description}'
 
     def add_info(self, info: dict):
+        if self.info is None:
+            self.info = {}
         for key, value in info.items():
             if key in self.info:
                 existing = self.info[key]
@@ -51,6 +65,8 @@ class TestReport(BaseDataModel):
                 self.info[key] = value
 
     def add_links(self, links: dict):
+        if self.info is None:
+            self.info = {}
         existing_links = self.info.get('links', {})
         if existing_links:
             for key, value in links.items():
@@ -61,13 +77,19 @@ class TestReport(BaseDataModel):
                 self.info['links'][key] = value
 
     def add_attachment(self, attachment: Attachment):
+        if self.attachments is None:
+            self.attachments = []
         self.attachments.append(attachment)
 
     def add_known_bug(self, bug):
+        if self.known_bugs is None:
+            self.known_bugs = []
         self.known_bugs.append(bug)
 
     def add_steps(self, steps_id):
-        if not isinstance(self.steps, list):
+        if self.steps is None:
+            self.steps = []
+        elif not isinstance(self.steps, list):
             self.steps = [self.steps]
 
         self.steps.append(steps_id)
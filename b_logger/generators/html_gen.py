@@ -1,39 +1,94 @@
-import json
-from jinja2 import Environment, FileSystemLoader
+import os
+from functools import lru_cache
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from b_logger.config import blog_config
+from b_logger.entities.attachments import Attachment
 from b_logger.entities.reports import RunReport
-from b_logger.utils.paths import pathfinder, b_logs_path
+from b_logger.utils.paths import templates_path, b_logs_path, data_path
+from b_logger.utils.serializers import serializer
+from b_logger.utils.steps_store import StepsReader
+
+# html is written in big chunks instead of one string holding the whole report
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache
+def environment() -> Environment:
+    """
+    Environment is created once per process. Compiled templates are kept in a per-user
+    bytecode cache in the temp dir, so next runs skip parsing and compiling them
+    """
+    env = Environment(
+        loader=FileSystemLoader(templates_path()),
+        bytecode_cache=FileSystemBytecodeCache(pattern='__blog_jinja2_%s.cache'),
+        auto_reload=False
+    )
+    env.filters['attachment_path'] = Attachment.resolve_path
+    return env
+
+
+def stream_template(template, path: str, **context):
+    """Renders template chunk by chunk straight into the file"""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(template.generate(**context))
 
 
 class HTMLGenerator:
     def __init__(self):
-        env = Environment(loader=FileSystemLoader(f'{pathfinder.library_root()}/b_logger/templates'))
-        self.template = env.get_template(f'base_template.html')
-        self.summary_template = env.get_template(f'summary_template.html')
+        env = environment()
+        self.template = env.get_template('base_template.html')
+        self.summary_template = env.get_template('summary_template.html')
         self.report_path = f'{b_logs_path()}/blog_report.json'
 
     def generate_html(self):
         combined_report = RunReport.from_json(self.report_path)
 
         try:
-            steps = combined_report.get_steps()
-
-            html = self.template.render(
-                report=combined_report,
-                steps=steps
-            )
+            # steps are read a test at a time while tests are rendered, never all at once
+            with StepsReader() as steps:
+                if blog_config.report_mode == 'lazy':
+                    self.generate_step_shards(combined_report, steps)
 
-            with open(f'{b_logs_path()}/blog_report.html', 'w', encoding='utf-8') as f:
-                f.write(html)
+                stream_template(
+                    self.template,
+                    f'{b_logs_path()}/blog_report.html',
+                    report=combined_report,
+                    steps=None if blog_config.report_mode == 'lazy' else steps
+                )
         except Exception as e:
             raise RuntimeError(f'blog_report.html generation failed: {e}')
 
         try:
-            html_summary = self.summary_template.render(
+            stream_template(
+                self.summary_template,
+                f'{b_logs_path()}/blog_summary.html',
                 report=combined_report
             )
-
-            with open(f'{b_logs_path()}/blog_summary.html', 'w', encoding='utf-8') as f:
-                f.write(html_summary)
         except Exception as e:
             raise RuntimeError(f'blog_summary.html generation failed: {e}')
+
+    def generate_step_shards(self, report: RunReport, steps: StepsReader):
+        """
+        Writes step tabs of every test run to b_logs/data/<first attempt id>.js, rendered with
+        the same macros as the full report. scripts.js adds them when the test is expanded.
+
+        Shards are JS (blogShard(id, {buttons, tabs})) instead of plain JSON,
+        so they load through a <script> tag when the report is opened from file://
+        """
+        os.makedirs(data_path(), exist_ok=True)
+        macros = environment().get_template('base_macros.html').module
+
+        for test_report in report.iter_test_reports():
+            attempt_ids = test_report.get('steps')
+            if not attempt_ids:
+                continue
+
+            shard = {
+                'buttons': str(macros.render_step_tab_buttons(test_report, steps)),
+                'tabs': str(macros.render_step_tabs(test_report, steps))
+            }
+
+            with open(f'{data_path()}/{attempt_ids[0]}.js', 'wb') as f:
+                f.write(b'blogShard(' + serializer().dumps(attempt_ids[0]) + b', ' + serializer().dumps(shard) + b');\n')
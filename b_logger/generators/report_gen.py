@@ -1,53 +1,91 @@
 import os
 from glob import glob
-from filelock import FileLock
 
-from b_logger.entities.reports import RunReport
+from b_logger.config import blog_config
+from b_logger.entities.reports import RunReport, RunResults
+from b_logger.utils.durations import scheduling_summary
+from b_logger.utils.journal import ReportJournal
+from b_logger.utils.parallel import parallel_map, tree_reduce
+from b_logger.utils.profiler import collect_overhead
 from b_logger.utils.paths import b_logs_path, clear_b_logs_tmp, b_logs_tmp_reports_path
 
 
+def load_report(rep_path: str) -> RunReport:
+    """
+    Reads a worker report together with its journal.
+    Runs in merge processes, so it is module level and returns a picklable RunReport
+    """
+    try:
+        report = RunReport.from_json(rep_path)
+
+        journal_path = ReportJournal.path_for(rep_path)
+        if os.path.exists(journal_path):
+            report.load_journal(journal_path)
+        else:
+            modules, report.modules = report.modules, RunReport._new_modules()
+            report.combine_modules(modules)
+            report.run_results = RunResults.from_dict(report.run_results or {})
+
+        return report
+    except Exception as e:
+        print(f'[BLogger][ERROR] Failed to process {rep_path}: {e}')
+        raise e
+
+
 class ReportGenerator:
     def __init__(self):
         self.combined = RunReport()
         self.combined.apply_config()
 
-    def generate_combined_report(self):
+    def generate_combined_report(self, scheduler=None):
         self.load_reports()
+        if scheduler is not None and scheduler.collection:
+            self.combined.set_scheduling(
+                scheduling_summary(self.combined.iter_test_reports(), scheduler.collection, scheduler.history)
+            )
+        if blog_config.profile:
+            self.combined.set_overhead(collect_overhead())
         self.combined.set_end_time()
         self.combined.count_duration()
         self.save()
-        self.clear_locks()
 
     def load_reports(self):
+        """
+        Worker reports are parsed on `merge_workers` processes,
+        then their modules and results are combined pairwise (tree reduction)
+        """
         report_files = glob(f'{b_logs_tmp_reports_path()}/report_*.json')
-        for rep_path in report_files:
-            try:
-                report = RunReport.from_json(rep_path)
-                self.merge(report)
-            except Exception as e:
-                print(f'[BLogger][ERROR] Failed to process {rep_path}: {e}')
-                raise e
+        reports = parallel_map(load_report, report_files, blog_config.merge_workers)
+
+        for report in reports:
+            self.merge_header(report)
+
+        reduced = tree_reduce(reports, self._reduce_pair)
+        if reduced is not None:
+            self._merge_run_results(reduced)
+            self._merge_module_results(reduced)
 
     def merge(self, report: RunReport):
+        self.merge_header(report)
+        self._merge_run_results(report)
+        self._merge_module_results(report)
+
+    def merge_header(self, report: RunReport):
         self._merge_proj_name(report)
         self._merge_env(report)
         self._merge_base_url(report)
         self._merge_start_time(report)
         self._merge_end_time(report)
         self._merge_report_ids(report)
-        self._merge_run_results(report)
-        self._merge_module_results(report)
-
-    def save(self, filename='blog_report'):
-        output_path = f'{b_logs_path()}/{filename}'
-        with FileLock(f'{output_path}.lock'):
-            self.combined.to_json_file(output_path)
 
     @staticmethod
-    def clear_locks():
-        for each in os.listdir(f'{b_logs_path()}'):
-            if '.lock' in each:
-                os.remove(f'{b_logs_path()}/{each}')
+    def _reduce_pair(left: RunReport, right: RunReport) -> RunReport:
+        left.combine_modules_from_report(right)
+        left.combine_run_results(right.run_results)
+        return left
+
+    def save(self, filename='blog_report'):
+        self.combined.to_json_file(f'{b_logs_path()}/{filename}', pretty=True)
 
     def _merge_proj_name(self, report: RunReport):
         if self.combined.proj_name and self.combined.proj_name != report.proj_name:
@@ -84,8 +122,7 @@ class ReportGenerator:
         self.combined.report_ids[report.worker] = report.report_id
 
     def _merge_run_results(self, report: RunReport):
-        for status, count in report.run_results.items():
-            self.combined.run_results.increase(status, count)
+        self.combined.combine_run_results(report.run_results)
 
     def _merge_module_results(self, report: RunReport):
         self.combined.combine_modules_from_report(report)
@@ -0,0 +1,31 @@
+"""
+Hooks added by b_logger. Implement them in conftest.py or in a plugin.
+"""
+
+
+def pytest_blog_attachment_stats(stats: dict, worker: str):
+    """
+    Called on every worker at session finish, after background attachment writes are drained
+
+    stats keys: enabled, workers, queue_size, queue_depth, max_queue_depth, submitted, written, failed, bytes,
+                avg_wait_ms, avg_write_ms, max_write_ms
+    """
+
+
+def pytest_blog_screenshot_stats(stats: dict, worker: str):
+    """
+    Called on every worker at session finish with timings of screenshots taken by b_logger
+
+    stats keys: format, captures, images, avg_capture_ms, max_capture_ms, encoded, avg_encode_ms, max_encode_ms,
+                bytes_in, bytes_out, skipped (captures skipped by the screenshot policy, by reason),
+                per_capture (list of {name, capture_ms, images})
+    """
+
+
+def pytest_blog_integration_stats(stats: dict, worker: str):
+    """
+    Called on every worker at session finish when Allure/Qase integrations are enabled
+
+    stats keys: buffered (events buffered for a batch), flushes,
+                adapters ({adapter class name: {calls, total_ms, avg_ms, max_ms}})
+    """
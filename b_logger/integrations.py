@@ -1,6 +1,7 @@
 import json
 import mimetypes
 import os
+import time
 from contextlib import contextmanager, ExitStack
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -199,43 +200,179 @@ class QaseAdapter(IntegrationBase):
                 print(f'[QASEAdapter][WARN] Failed to attach {name}: {e}')
 
 
-adapters = [QaseAdapter(), AllureAdapter()]
+_adapters: list[IntegrationBase] | None = None
+_enabled: list[IntegrationBase] | None = None
+
+
+def get_adapters() -> list[IntegrationBase]:
+    """Adapters of integrations turned on in blog.config.yaml. allure/qase are imported on first use only"""
+    global _adapters
+    if _adapters is None:
+        _adapters = []
+        if blog_config.qase:
+            _adapters.append(QaseAdapter())
+        if blog_config.allure:
+            _adapters.append(AllureAdapter())
+    return _adapters
+
+
+def enabled_adapters() -> list[IntegrationBase]:
+    """Resolved once per session, is_enabled() doesn't change during a run"""
+    global _enabled
+    if _enabled is None:
+        _enabled = [a for a in get_adapters() if a.is_enabled()]
+    return _enabled
+
+
+def serialize(content, type_=None) -> tuple:
+    """Content and type as adapters attach them, done once per payload and shared by all adapters"""
+    if isinstance(content, (dict, list)):
+        return process_json(content), 'application/json'
+    if isinstance(content, (int, float, bool)):
+        return str(content), 'text/plain'
+    return content, type_
+
+
+class IntegrationStats:
+    """Time spent in every integration adapter, passed to pytest_blog_integration_stats at session finish"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.adapters: dict[str, dict] = {}
+        self.buffered = 0
+        self.flushes = 0
+
+    def add(self, adapter: IntegrationBase, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self.adapters.setdefault(type(adapter).__name__, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['calls'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def stats(self) -> dict:
+        return {
+            'buffered': self.buffered,
+            'flushes': self.flushes,
+            'adapters': {
+                name: {**values, 'total_ms': round(values['total_ms'], 3), 'max_ms': round(values['max_ms'], 3),
+                       'avg_ms': round(values['total_ms'] / values['calls'], 3) if values['calls'] else 0}
+                for name, values in self.adapters.items()
+            }
+        }
+
+
+integration_stats = IntegrationStats()
 
 
 class Integrations:
+    """
+    Fan-out to enabled integrations.
+    Info, prints and attachments are buffered and sent at step, fixture, stage and test boundaries:
+    consecutive info calls go to adapter.info() as one batch named by its keys, consecutive text prints
+    as one `blog_prints` attachment (json prints are attached one by one). Steps, links and descriptions are sent right away
+    """
+
+    _buffer: list[tuple[str, object]] = []
+
     @staticmethod
     def enabled():
-        return [a for a in adapters if a.is_enabled()]
+        return list(enabled_adapters())
 
     @staticmethod
     @contextmanager
     def step(title, expected=None):
+        adapters = enabled_adapters()
+        if not adapters:
+            yield
+            return
+
+        Integrations.flush()
+
         with ExitStack() as stack:
             for adapter in adapters:
-                if adapter.is_enabled():
-                    stack.enter_context(adapter.step(title, expected))
-            yield
+                started = time.perf_counter()
+                stack.enter_context(adapter.step(title, expected))
+                integration_stats.add(adapter, started)
+            try:
+                yield
+            finally:
+                Integrations.flush()
 
     @staticmethod
     def description(text):
-        for a in adapters:
-            if a.is_enabled():
-                a.description(text)
+        Integrations._send('description', text)
 
     @staticmethod
     def info(name, value):
-        for a in adapters:
-            if a.is_enabled():
-                a.info(name, value)
+        Integrations._add('info', {name: value})
+
+    @staticmethod
+    def info_batch(info: dict):
+        Integrations._add('info', dict(info))
 
     @staticmethod
     def link(url, name):
-        for a in adapters:
-            if a.is_enabled():
-                a.link(url, name)
+        Integrations._send('link', url, name)
+
+    @staticmethod
+    def print(text: str):
+        """Text prints only, json prints go as separate attachments"""
+        Integrations._add('print', text)
 
     @staticmethod
     def attach(content, name, type_):
-        for a in adapters:
-            if a.is_enabled():
-                a.attach(content, name, type_)
+        Integrations._add('attach', (content, name, type_))
+
+    @staticmethod
+    def _add(kind: str, payload):
+        if not enabled_adapters():
+            return
+
+        buffer = Integrations._buffer
+        integration_stats.buffered += 1
+
+        # merged with the previous event of the same kind, so a batch is sent as one attachment
+        if buffer and buffer[-1][0] == kind == 'info':
+            buffer[-1][1].update(payload)
+        elif buffer and buffer[-1][0] == kind == 'print':
+            buffer[-1] = (kind, f'{buffer[-1][1]}\n{payload}')
+        else:
+            buffer.append((kind, payload))
+
+    @staticmethod
+    def flush():
+        """Sends buffered events in order. Called at step boundaries, at the start of call/teardown and at test end"""
+        if not Integrations._buffer:
+            return
+
+        events, Integrations._buffer = Integrations._buffer, []
+        integration_stats.flushes += 1
+
+        for kind, payload in events:
+            if kind == 'info':
+                # a single key goes under its own name, as an unbatched info call would
+                if len(payload) == 1:
+                    Integrations._send('info', *next(iter(payload.items())))
+                else:
+                    Integrations._send('info', ', '.join(payload), payload)
+                continue
+
+            if kind == 'print':
+                content, name, type_ = payload, 'blog_prints', 'text/plain'
+            else:
+                content, name, type_ = payload
+                content, type_ = serialize(content, type_)
+
+            Integrations._send('attach', content, name, type_)
+
+    @staticmethod
+    def _send(method: str, *args):
+        for adapter in enabled_adapters():
+            started = time.perf_counter()
+            try:
+                getattr(adapter, method)(*args)
+            except Exception as e:
+                print(f'[BLogger][WARN] {type(adapter).__name__}.{method} failed: {e}')
+            integration_stats.add(adapter, started)
@@ -15,9 +15,13 @@ limitations under the License.
 """
 
 from b_logger.config import blog_config
-from b_logger.generators.html_gen import HTMLGenerator
-from b_logger.generators.report_gen import ReportGenerator
+from b_logger.entities.attachments import Attachment
+from b_logger.integrations import Integrations, integration_stats
 from b_logger.utils.py_addons import BlogPyAddons
+from b_logger.utils.attachment_writer import attachment_writer
+from b_logger.utils.live import LiveFeed
+from b_logger.utils.profiler import profiler
+from b_logger.utils.screenshots import screenshot_stats
 from b_logger.utils.paths import *
 from b_logger.runtime import RunTime
 
@@ -42,6 +46,14 @@ runtime = RunTime()
 
 debug = False
 
+_scheduler = None
+
+
+def pytest_addhooks(pluginmanager):
+    from b_logger import hooks
+
+    pluginmanager.add_hookspecs(hooks)
+
 
 def pytest_addoption(parser):
     group = parser.getgroup('pytest-b-logger')
@@ -56,27 +68,94 @@ def pytest_configure(config):
 
     blog_config.rootpath = str(config.rootpath)
 
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput and workerinput.get('blog_b_logs_dir'):
+        blog_config.b_logs_dir = workerinput['blog_b_logs_dir']
+
+    set_b_logs_dir(blog_config.b_logs_dir)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist: workers get b_logs location already resolved by the controller"""
+    node.workerinput['blog_b_logs_dir'] = b_logs_path()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """xdist: with duration_scheduling `--dist load` runs the longest tests first"""
+    global _scheduler
+
+    if not blog_config.duration_scheduling or config.getvalue('dist') != 'load':
+        return None
+
+    from b_logger.scheduling import DurationScheduling
+    from b_logger.utils.durations import DurationHistory
+
+    history = DurationHistory.resolve(blog_config.duration_history).load()
+    _scheduler = DurationScheduling(config, log, history)
+    return _scheduler
+
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionstart(session):
+    Attachment.forget_blobs()
+
     if _is_main_worker(session):
         init_dirs()
 
+        if blog_config.live_report:
+            LiveFeed.init()
+
     worker = get_xdist_worker_id(session)
     runtime.run_report.set_worker(worker)
 
+    if blog_config.profile and not is_xdist_controller(session):
+        profiler.install()
+
+    if blog_config.live_report:
+        runtime.open_live(worker)
+
+    if blog_config.async_attachments:
+        attachment_writer.configure(blog_config.attachment_workers, blog_config.attachment_queue_size)
+
+    if blog_config.spill_reports and not blog_config.journal:
+        print('[BLogger][WARN] spill_reports requires journal: True, test reports are kept in memory')
+
+    if blog_config.journal and not is_xdist_controller(session):
+        runtime.run_report.save_json()
+        runtime.open_journal(blog_config.journal_fsync_every, spill=blog_config.spill_reports)
+
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session):
     if not is_xdist_controller(session):
+        _drain_attachments(session)
+        _report_screenshot_stats(session)
+        _report_integration_stats(session)
+        runtime.close_journal()
+        runtime.close_steps()
         runtime.run_report.set_end_time()
         runtime.run_report.count_duration()
         runtime.run_report.save_json()
 
+        if profiler.installed:
+            profiler.save(get_xdist_worker_id(session))
+
     if _is_main_worker(session):
+        # generators (jinja2, dateutil) are imported only where reports are built, not in every xdist worker
+        from b_logger.generators.html_gen import HTMLGenerator
+        from b_logger.generators.report_gen import ReportGenerator
+
         try:
             report_generator: ReportGenerator = ReportGenerator()
-            report_generator.generate_combined_report()
+            report_generator.generate_combined_report(scheduler=_scheduler)
+
+            if blog_config.archive_dir:
+                _archive_run(report_generator.combined)
+
+            if blog_config.duration_scheduling:
+                _update_duration_history(report_generator.combined)
         except Exception as e:
             print(f'[BLogger][ERROR] Unable to generate blog_report.json: {e}')
 
@@ -86,9 +165,70 @@ def pytest_sessionfinish(session):
         except Exception as e:
             print(f'[BLogger][ERROR] Unable to generate html reports! {e}')
 
+        if runtime.live:
+            runtime.live.finish()
+
         if not debug:
             clear_b_logs_tmp(rmdir=True)
 
+    runtime.close_live()
+
+
+def pytest_collection_finish(session):
+    if runtime.live:
+        runtime.live.start(len(session.items))
+
+
+def _archive_run(combined_report):
+    from b_logger.archive import RunArchive
+
+    try:
+        RunArchive.resolve(blog_config.archive_dir).write_run(combined_report)
+    except Exception as e:
+        print(f'[BLogger][ERROR] Unable to archive the run: {e}')
+
+
+def _update_duration_history(combined_report):
+    from b_logger.utils.durations import DurationHistory
+
+    try:
+        DurationHistory.resolve(blog_config.duration_history).update(combined_report.iter_test_reports())
+    except Exception as e:
+        print(f'[BLogger][ERROR] Unable to update duration history: {e}')
+
+
+def _drain_attachments(session):
+    # writes from async tests go to the pool even without async_attachments
+    attachment_writer.drain()
+
+    if not attachment_writer.enabled:
+        return
+
+    session.config.hook.pytest_blog_attachment_stats(
+        stats=attachment_writer.stats(),
+        worker=get_xdist_worker_id(session)
+    )
+
+
+def _report_screenshot_stats(session):
+    if not screenshot_stats.captures:
+        return
+
+    session.config.hook.pytest_blog_screenshot_stats(
+        stats=screenshot_stats.stats(),
+        worker=get_xdist_worker_id(session)
+    )
+
+
+def _report_integration_stats(session):
+    if not integration_stats.adapters:
+        return
+
+    session.config.hook.pytest_blog_integration_stats(
+        stats=integration_stats.stats(),
+        worker=get_xdist_worker_id(session)
+    )
+
 
 def _is_main_worker(session) -> bool:
     return is_xdist_controller(session) or get_xdist_worker_id(session) == 'master'
@@ -99,7 +239,9 @@ def pytest_runtest_protocol(item, nextitem):
     runtime.start_test(item)
     yield
     runtime.finish_test()
-    runtime.run_report.save_json()
+
+    if not runtime.journal:
+        runtime.run_report.save_json()
 
 
 @pytest.hookimpl
@@ -124,6 +266,7 @@ def pytest_runtest_setup(item):
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_runtest_call(item):
+    Integrations.flush()
     runtime.step_container.current_stage = 'call'
 
     _apply_browser(item)
@@ -131,9 +274,19 @@ def pytest_runtest_call(item):
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_runtest_teardown(item):
+    # the test's event loop is still alive, fixtures are not finalized yet
+    runtime.wait_screenshots()
+    Integrations.flush()
     runtime.step_container.current_stage = 'teardown'
 
 
+@pytest.hookimpl(trylast=True, hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    # innermost wrapper: events of a fixture are sent while its allure/qase fixture context is still open
+    yield
+    Integrations.flush()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(call, item):
 
@@ -213,7 +366,7 @@ def _apply_browser(item):
         if browser_name in item.fixturenames:
             try:
                 browser = item.funcargs.get(browser_name, None)
-                if browser != runtime.browser:
+                if browser is not runtime.browser:
                     runtime.set_browser(browser)
             except Exception as e:
                 print(f'[BLogger][WARN] Error setting up browser automatically: {e}')
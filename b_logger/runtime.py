@@ -14,10 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import time
 import traceback
 from pathlib import Path
 from typing import Union, BinaryIO, Optional, Any
 
+from b_logger.config import blog_config
 from b_logger.entities.reports import RunReport
 from b_logger.entities.tests import TestReport, TestStatus
 from b_logger.entities.attachments import Attachment
@@ -25,7 +27,12 @@ from b_logger.entities.prints import Print
 from b_logger.entities.steps import Step, StepStatus, StepError, StepContainer
 from b_logger.entities.statuses import py_outcome_to_tstatus
 from b_logger.integrations import Integrations
-from b_logger.utils.browser_adapters import get_browser_adapter
+from b_logger.utils.aio import current_task, done
+from b_logger.utils.browser_adapters import BrowserAdapter, adapter_class
+from b_logger.utils.journal import ReportJournal
+from b_logger.utils.live import LiveFeed
+from b_logger.utils.screenshots import policy as screenshot_policy, screenshot_stats
+from b_logger.utils.steps_store import StepsWriter
 from b_logger.utils.json_handler import process_json
 
 
@@ -33,8 +40,43 @@ class RunTime:
     def __init__(self):
         self.run_report: RunReport = RunReport()
         self.browser: "RemoteWebDriver | WebDriver | Page | None" = None
+        self.browser_adapter: Optional[BrowserAdapter] = None
         self.test_report: TestReport = TestReport()
         self.step_container: StepContainer = StepContainer()
+        self.journal: ReportJournal | None = None
+        self.steps_writer: StepsWriter | None = None
+        # screenshots of async adapters requested in coroutines, finished at step exit, teardown and test end
+        self.screenshot_tasks: set = set()
+        self.spill: bool = False
+        self.live: LiveFeed | None = None
+
+    def open_journal(self, fsync_every: int = 50, spill: bool = False):
+        """With spill=True finished TestReports are kept only in the journal, RunReport gets counters and TestIndex"""
+        self.journal = ReportJournal(self.run_report.journal_path(), fsync_every)
+        self.spill = spill
+
+    def close_journal(self):
+        if self.journal:
+            self.journal.close()
+
+    def save_steps(self):
+        """Appends steps of the current attempt to the worker steps file"""
+        if self.steps_writer is None:
+            self.steps_writer = StepsWriter(self.run_report.report_id, compression=blog_config.steps_compression)
+
+        self.steps_writer.append(self.test_report.nodeid, self.step_container)
+        self.test_report.add_steps(self.step_container.container_id)
+
+    def close_steps(self):
+        if self.steps_writer:
+            self.steps_writer.close()
+
+    def open_live(self, worker: str):
+        self.live = LiveFeed(worker)
+
+    def close_live(self):
+        if self.live:
+            self.live.close()
 
     def set_env(self, env: str):
         self.run_report.set_env(env)
@@ -43,7 +85,18 @@ class RunTime:
         self.run_report.set_base_url(base_url)
 
     def set_browser(self, browser: "RemoteWebDriver | WebDriver | Page"):
+        if browser is not self.browser:
+            # screenshots of another browser's pages must not be deduplicated against this one
+            screenshot_policy().forget_pages()
         self.browser = browser
+        self.browser_adapter = None
+
+        if browser is None:
+            return
+
+        adapter_cls = adapter_class(browser)
+        if adapter_cls is not None:
+            self.browser_adapter = adapter_cls(browser)
 
     def start_test(self, item):
         module = item.location[0]
@@ -51,26 +104,40 @@ class RunTime:
         test_originalname = item.originalname
 
         self.test_report = TestReport(module, test_name, test_originalname)
+        self.test_report.set_worker(self.run_report.worker)
+        self.test_report.set_nodeid(item.nodeid)
         self.step_container = StepContainer()
+        screenshot_policy().start_test()
 
     def finish_test(self):
-        self.step_container.save_json()
-        self.test_report.add_steps(self.step_container.container_id)
+        self.wait_screenshots()
+        self.save_steps()
+
+        if self.spill:
+            offset = self.journal.append(self.test_report)
+            self.run_report.add_test_index(self.test_report, offset)
+        else:
+            self.run_report.add_test_report(self.test_report)
 
-        self.run_report.add_test_report(self.test_report)
+            if self.journal:
+                self.journal.append(self.test_report)
+
+        if self.live:
+            self.live.add_test(self.test_report)
 
         del self.test_report, self.step_container
 
         if self.browser:
             self.browser = None
+            self.browser_adapter = None
+            screenshot_policy().forget_pages()
 
     def start_retry(self):
         self.test_report.description = None
-        self.test_report.info = {}
-        self.test_report.known_bugs = []
+        self.test_report.info = None
+        self.test_report.known_bugs = None
 
-        self.step_container.save_json()
-        self.test_report.add_steps(self.step_container.container_id)
+        self.save_steps()
 
         self.step_container = StepContainer()
 
@@ -151,22 +218,21 @@ class RunTime:
         return status
 
     def start_step(self, step: Step):
-        if self.step_container.current_step_id is not None:
-            parent = self.step_container.get_current_step()
-            step.set_parent_id(parent.id)
+        parent = self.step_container.get_current_step()
 
+        if parent is not None:
+            step.set_parent_id(parent.id)
             parent.add_sub_step(step)
-
-            self.step_container.set_current_step(step.id)
-
         else:
-            self.step_container.set_current_step(step.id)
             self.step_container.add_step(step)
 
-    def handle_step_result(self, step: Step, exc=None):
+        self.step_container.push_step(step)
+
+    def handle_step_result(self, step: Step, exc=None, err_scr: bool = True):
         if exc:
             if not self.step_container.failed:
-                self.make_step_err_scr(step)
+                if err_scr:
+                    self.make_step_err_scr(step)
 
                 step.set_error(StepError(exc, traceback.format_exc(4)))
 
@@ -181,9 +247,16 @@ class RunTime:
 
         step.set_status(StepStatus.PASSED)
 
+    async def handle_step_result_async(self, step: Step, exc=None):
+        """handle_step_result of `async with blog.step()`, the error screenshot is awaited in the test's event loop"""
+        if exc and not self.step_container.failed:
+            await self.make_step_err_scr_async(step)
+
+        self.handle_step_result(step, exc, err_scr=False)
+
     def finish_step(self, step: Step):
         step.count_duration()
-        self.step_container.set_current_step(step.parent_id)
+        self.step_container.pop_step(step)
 
     def apply_description(self, description: str):
         if not self.test_report.description:
@@ -204,7 +277,7 @@ class RunTime:
 
             info[key] = v
 
-            Integrations.info(k, v)
+        Integrations.info_batch(kwargs)
 
         current_step = self.step_container.get_current_step()
 
@@ -249,12 +322,11 @@ class RunTime:
         self.test_report.add_known_bug(bug)
 
     def print_message(self, message: Any):
-        if isinstance(message, (dict, list)):
+        is_json = isinstance(message, (dict, list))
+        if is_json:
             data = process_json(message)
-            type_ = 'application/json'
         else:
             data = str(message)
-            type_ = 'text/plain'
 
         print_ = Print(data)
 
@@ -268,63 +340,160 @@ class RunTime:
 
         print(f'{data}')
 
-        Integrations.attach(data, print_.id, type_)
+        if is_json:
+            Integrations.attach(data, print_.id, 'application/json')
+        else:
+            Integrations.print(data)
 
     def make_screenshot(self, scr_name: Optional[str] = None, is_error: bool = False):
-        if self.browser is None:
-            return
+        """Returns an awaitable when called from a coroutine, async adapters capture in a task of the test's loop"""
+        in_coroutine = current_task() is not None
+
+        if self.browser_adapter is None:
+            return done() if in_coroutine else None
 
         scr_name = (
             f'{"err_" if is_error else ""}'
             f'scr_{self.test_report.name if not scr_name else scr_name}.png'
         )
 
-        adapter = get_browser_adapter(self.browser)
+        if in_coroutine and self.browser_adapter.is_async:
+            import asyncio
+            task = asyncio.ensure_future(
+                self._make_screenshot_async(scr_name, self.step_container.get_current_step(), self.test_report)
+            )
+            self.screenshot_tasks.add(task)
+            task.add_done_callback(self.screenshot_tasks.discard)
+            return task
 
         try:
-            screenshot_bytes = adapter.make_screenshot()
+            for attachment, png in self._take_screenshots(scr_name, scr_name):
+                self._add_attachment(attachment)
+                if png is not None:
+                    Integrations.attach(png, scr_name, 'image/png')
+        except Exception as e:
+            print(f'[BLogger][ERROR] Unable to make screenshot: {e}')
 
-            if screenshot_bytes:
-                if isinstance(screenshot_bytes, list):
-                    for scr in screenshot_bytes:
-                        self.attach(scr, scr_name)
-                else:
-                    self.attach(screenshot_bytes, scr_name)
+        return done() if in_coroutine else None
+
+    async def wait_screenshots_async(self):
+        """Screenshots requested without await are finished before the step ends"""
+        tasks = [task for task in self.screenshot_tasks if task is not current_task()]
+        if tasks:
+            import asyncio
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def wait_screenshots(self):
+        """Outside the event loop (teardown, test end): pending screenshots are run on their loop while it is alive"""
+        tasks = [task for task in self.screenshot_tasks if not task.done()]
+        self.screenshot_tasks.clear()
+        if not tasks:
+            return
+
+        import asyncio
+
+        loop = tasks[0].get_loop()
+        if loop.is_running() or loop.is_closed():
+            print(f'[BLogger][WARN] {len(tasks)} screenshot(s) requested without await were not finished '
+                  f'before the end of the test, use `await blog.screenshot()`')
+            return
+
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    async def _make_screenshot_async(self, scr_name: str, step: Optional[Step], test_report: TestReport):
+        """Attached to the step and test that were current when the screenshot was requested"""
+        try:
+            for attachment, png in await self._take_screenshots_async(scr_name, scr_name):
+                if step:
+                    step.add_attachment(attachment)
+                test_report.add_attachment(attachment)
+                if png is not None:
+                    Integrations.attach(png, scr_name, 'image/png')
         except Exception as e:
             print(f'[BLogger][ERROR] Unable to make screenshot: {e}')
 
     def make_step_err_scr(self, step: Step):
-        if self.browser is None:
+        if self.browser_adapter is None:
             return
 
-        adapter = get_browser_adapter(self.browser)
-
         try:
-            screenshot_bytes = adapter.make_screenshot()
+            for attachment, _ in self._take_screenshots(f'step: {step.title}'):
+                step.add_attachment(attachment)
+        except Exception as e:
+            print(f'[BLogger][ERROR] Unable to make step error screenshot for step {step.title}: {e}')
 
-            if screenshot_bytes:
-                if isinstance(screenshot_bytes, list):
-                    for scr in screenshot_bytes:
-                        step.add_attachment(Attachment(scr))
-                else:
-                    step.add_attachment(Attachment(screenshot_bytes))
+    async def make_step_err_scr_async(self, step: Step):
+        if self.browser_adapter is None:
+            return
+
+        try:
+            for attachment, _ in await self._take_screenshots_async(f'step: {step.title}'):
+                step.add_attachment(attachment)
         except Exception as e:
             print(f'[BLogger][ERROR] Unable to make step error screenshot for step {step.title}: {e}')
 
+    def _take_screenshots(self, label: str, name: Optional[str] = None) -> list[tuple[Attachment, Optional[bytes]]]:
+        """
+        (attachment, png) per browser page, as allowed by the screenshot policy.
+        A skipped screenshot is a duplicate of the page's previous one and has no png
+        """
+        skipped = self._skipped_screenshots()
+        if skipped is not None:
+            return skipped
+
+        started = time.perf_counter()
+        screenshot_bytes = self.browser_adapter.make_screenshot()
+        return self._store_screenshots(label, started, screenshot_bytes, name)
+
+    async def _take_screenshots_async(self, label: str, name: Optional[str] = None) -> list[tuple[Attachment, Optional[bytes]]]:
+        skipped = self._skipped_screenshots()
+        if skipped is not None:
+            return skipped
+
+        started = time.perf_counter()
+        screenshot_bytes = await self.browser_adapter.make_screenshot_async()
+        return self._store_screenshots(label, started, screenshot_bytes, name)
+
+    def _skipped_screenshots(self) -> Optional[list[tuple[Attachment, None]]]:
+        """Duplicates recorded instead of a capture the screenshot policy doesn't allow, None if it is allowed"""
+        policy = screenshot_policy()
+
+        reason = policy.acquire()
+        if reason:
+            return [(attachment, None) for attachment in policy.skip(reason)]
+        return None
+
+    def _store_screenshots(self, label: str, started: float, screenshot_bytes: bytes | list | None,
+                           name: Optional[str] = None) -> list[tuple[Attachment, Optional[bytes]]]:
+        """
+        Only capture happens on the test thread: re-encoding (screenshot_format/max_size) with the write
+        runs on the attachment writer pool, plain PNG writes go there with async_attachments
+        """
+        screenshots = [scr for scr in (screenshot_bytes if isinstance(screenshot_bytes, list) else [screenshot_bytes]) if scr]
+        screenshot_stats.add_capture(label, time.perf_counter() - started, len(screenshots))
+
+        policy = screenshot_policy()
+        stored = (policy.store(index, png, name) for index, png in enumerate(screenshots))
+        return [(attachment, png) for attachment, png in stored if attachment is not None]
+
     def attach(self, content: Union[bytes, Path, BinaryIO, str, dict, list, int, float, bool, None], name: Optional[str] = None):
 
         attachment = Attachment(content=content, name=name)
 
+        self._add_attachment(attachment)
+
+        if name not in ['stdout', 'stderr', 'log']:
+            Integrations.attach(content, attachment.name, attachment.type_)
+
+    def _add_attachment(self, attachment: Attachment):
         current_step = self.step_container.get_current_step()
         if current_step:
             current_step.add_attachment(attachment)
 
         self.test_report.add_attachment(attachment)
 
-        if name not in ['stdout', 'stderr', 'log']:
-            Integrations.attach(content, attachment.name, attachment.type_)
-
     def apply_integrations(self):
+        """All info of the test goes as one `blog_info` attachment, what is still buffered is flushed here"""
         d = self.test_report.description
         if d:
             Integrations.description(d)
@@ -336,3 +505,5 @@ class RunTime:
         kb = self.test_report.known_bugs
         if kb:
             Integrations.attach(process_json(kb), 'blog_known_bugs', 'text/html')
+
+        Integrations.flush()
@@ -0,0 +1,143 @@
+import pytest
+from xdist.report import report_collection_diff
+from xdist.workermanage import parse_tx_spec_config
+
+from b_logger.utils.durations import DURATION_PREFETCH, estimate, lpt_order
+
+
+class DurationScheduling:
+    """
+    `--dist load` with longest-processing-time-first order based on b_logger duration history
+
+    Tests are sorted by expected duration, longest first. Every node holds only the running test
+    and the next one, so whichever node frees up first takes the next longest test
+    and workers finish close to each other instead of one of them running a tail of slow tests.
+
+    Implements the scheduler interface returned from pytest_xdist_make_scheduler on its own,
+    nodes are driven only through send_runtest_some() and shutdown(), no LoadScheduling internals.
+    """
+
+    def __init__(self, config, log=None, history: dict[str, float] = None):
+        self.config = config
+        self.log = log.durationsched if log is not None else (lambda *args: None)
+        self.history = history or {}
+        self.numnodes = len(parse_tx_spec_config(config))
+        # node -> its collection, all of them must be the same
+        self.node2collection: dict = {}
+        # node -> collection indices sent to it and not finished yet, the first one is running
+        self.node2pending: dict = {}
+        # collection indices not sent to any node, longest expected first
+        self.pending: list[int] = []
+        self.collection: list[str] | None = None
+
+    @property
+    def nodes(self) -> list:
+        return list(self.node2pending)
+
+    @property
+    def collection_is_completed(self) -> bool:
+        return len(self.node2collection) >= self.numnodes
+
+    @property
+    def tests_finished(self) -> bool:
+        if not self.collection_is_completed or self.pending:
+            return False
+        return all(len(pending) < 2 for pending in self.node2pending.values())
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self.pending) or any(self.node2pending.values())
+
+    def add_node(self, node):
+        self.node2pending[node] = []
+
+    def add_node_collection(self, node, collection):
+        if self.collection_is_completed:
+            # a node started later, when one of the first ones died
+            first = next(iter(self.node2collection))
+            diff = report_collection_diff(self.collection, collection, first.gateway.id, node.gateway.id)
+            if diff:
+                self.log(diff)
+                return
+
+        self.node2collection[node] = list(collection)
+
+    def mark_test_complete(self, node, item_index: int, duration: float = 0):
+        self.node2pending[node].remove(item_index)
+        self.check_schedule(node, duration)
+
+    def mark_test_pending(self, item: str):
+        self.pending.insert(0, self.collection.index(item))
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def remove_pending_tests_from_node(self, node, indices):
+        for index in indices:
+            self.node2pending[node].remove(index)
+        self.pending[:0] = indices
+
+    def remove_node(self, node) -> str | None:
+        """Tests of a crashed node go back to the front of the queue, the running one is returned as crashed"""
+        pending = self.node2pending.pop(node)
+        if not pending:
+            return None
+
+        crashed = self.collection[pending.pop(0)]
+        self.pending[:0] = pending
+        for other in self.nodes:
+            self.check_schedule(other)
+        return crashed
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._same_collections():
+            self.log('**Different tests collected, aborting run**')
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending[:] = lpt_order(estimate(self.collection, self.history))
+        if not self.collection:
+            return
+
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration: float = 0):
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            missing = DURATION_PREFETCH - len(self.node2pending[node])
+            if missing > 0:
+                self._send(node, missing)
+        else:
+            node.shutdown()
+
+        self.log('num items waiting for node:', len(self.pending))
+
+    def _send(self, node, count: int):
+        indices = self.pending[:count]
+        del self.pending[:count]
+        self.node2pending[node].extend(indices)
+        node.send_runtest_some(indices)
+
+    def _same_collections(self) -> bool:
+        (first, collection), *others = self.node2collection.items()
+        same = True
+
+        for node, other in others:
+            diff = report_collection_diff(collection, other, first.gateway.id, node.gateway.id)
+            if diff:
+                same = False
+                self.log(diff)
+                self.config.hook.pytest_collectreport(
+                    report=pytest.CollectReport(nodeid=node.gateway.id, outcome='failed', longrepr=diff, result=[])
+                )
+
+        return same
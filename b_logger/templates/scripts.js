@@ -93,6 +93,7 @@ function initPage() {
 
             toggleClass(header, 'expanded', newState);
             toggleClass(content, 'active', newState);
+            if (newState) ensureSteps(test);
 
             if (test.id) updateExpandedState(test.id, newState);
         }
@@ -449,6 +450,7 @@ function toggleTestAndHash(header) {
     const content = header.nextElementSibling;
     const isOpening = !content.classList.contains('active');
     toggleBlock(header);
+    if (isOpening) ensureSteps(el);
     updateExpandedState(el.id, isOpening);
     history.pushState(
         isOpening ? { openedId: el.id } : {},
@@ -481,11 +483,13 @@ function restoreExpandedState() {
 
         toggleClass(header, 'expanded', state[id]);
         toggleClass(content, 'active', state[id]);
+        if (state[id]) ensureSteps(el);
     });
 }
 
 function expandTestAndParents(el) {
     if (!el) return;
+    ensureSteps(el);
     let current = el;
     while (current) {
         const header = getElBySelector(':scope > .test-header, :scope > .test-header-multi, :scope > .header', current);
@@ -529,6 +533,60 @@ window.addEventListener('popstate', event => {
 });
 
 
+// ======================================================
+//  Lazy Steps (report_mode: lazy)
+// ======================================================
+
+// Steps are not rendered into the page. Each test run has a shard in b_logs/data
+// (blogShard("<first attempt id>", {buttons, tabs})), loaded through a <script> tag,
+// so it works from file:// too. The html is rendered by html_gen with the base_macros.html macros
+
+const stepShards = {};
+const stepShardWaiters = {};
+
+function blogShard(id, shard) {
+    stepShards[id] = shard;
+    (stepShardWaiters[id] || []).forEach(callback => callback(shard));
+    delete stepShardWaiters[id];
+}
+
+function loadStepShard(id, callback) {
+    if (stepShards[id]) {
+        callback(stepShards[id]);
+        return;
+    }
+    if (stepShardWaiters[id]) {
+        stepShardWaiters[id].push(callback);
+        return;
+    }
+
+    stepShardWaiters[id] = [callback];
+    const script = document.createElement('script');
+    script.src = `data/${id}.js`;
+    script.onerror = () => {
+        delete stepShardWaiters[id];
+        console.error(`Unable to load steps: data/${id}.js`);
+    };
+    document.head.appendChild(script);
+}
+
+function ensureSteps(testEl) {
+    if (!testEl) return;
+
+    getAll('.tabs[data-steps]', testEl).forEach(tabs => {
+        if (tabs.dataset.stepsState) return;
+        tabs.dataset.stepsState = 'loading';
+
+        const attemptIds = tabs.dataset.steps.split(',');
+        loadStepShard(attemptIds[0], shard => {
+            getElBySelector('.tab-nav > .tab-btn', tabs)?.insertAdjacentHTML('afterend', shard.buttons);
+            getElBySelector(':scope > .tab-content[data-tab="overview"]', tabs)?.insertAdjacentHTML('afterend', shard.tabs);
+            tabs.dataset.stepsState = 'loaded';
+        });
+    });
+}
+
+
 // ======================================================
 //  Attachment Modal
 // ======================================================
@@ -547,9 +605,7 @@ let isDragging = false;
 let startX = 0, startY = 0;
 let offsetX = 0, offsetY = 0;
 
-function openAttachment(name, type) {
-    const path = `attachments/${name}`;
-
+function openAttachment(name, type, path = `attachments/${name}`) {
     resetModal();
     if (titleEl) titleEl.textContent = name;
 
@@ -0,0 +1,25 @@
+import sys
+
+
+def current_task():
+    """
+    asyncio task of the calling code, None outside coroutines.
+    Sync Playwright marks its loop as running in the test thread, so a running loop alone doesn't mean async code
+    """
+    asyncio = sys.modules.get('asyncio')
+    if asyncio is None:
+        return None
+
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+def done(value=None):
+    """Finished awaitable, returned by APIs that can be awaited in async tests but completed synchronously"""
+    import asyncio
+
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
@@ -0,0 +1,136 @@
+import time
+import threading
+from typing import Callable
+
+from b_logger.utils.aio import current_task
+
+
+class AttachmentWriter:
+    """
+    Background writer for attachment files
+
+    Writes run on a small thread pool. The queue is bounded by `queue_size`:
+    when it is full, submit() blocks the test thread until a slot frees up (backpressure).
+
+    Usage:
+        attachment_writer.configure(workers=2, queue_size=64)
+        attachment_writer.submit(write_func, dest, data)
+        attachment_writer.drain()
+        attachment_writer.stats()
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.workers = 2
+        self.queue_size = 64
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def configure(self, workers: int = 2, queue_size: int = 64):
+        self.drain()
+
+        self.enabled = True
+        self.workers = max(int(workers), 1)
+        self.queue_size = max(int(queue_size), 1)
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._reset_stats()
+
+    def submit(self, func: Callable, *args, size: int = 0, background: bool = False):
+        """
+        Writes go to the pool when the writer is configured (async_attachments).
+        Writes from coroutines and `background` ones (screenshot encoding) always do,
+        so neither the test thread nor the test's event loop waits for them
+        """
+        in_coroutine = current_task() is not None
+
+        if not self.enabled and not in_coroutine and not background:
+            func(*args)
+            return
+
+        # the event loop doesn't wait for a slot, with a full queue the write is done in place
+        if not self._slots.acquire(blocking=not in_coroutine):
+            func(*args)
+            return
+
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='blog-writer')
+            self._depth += 1
+            self._submitted += 1
+            self._max_depth = max(self._max_depth, self._depth)
+            # drain() may swap the pool out as soon as the lock is released
+            executor = self._executor
+
+        try:
+            executor.submit(self._run, func, args, size, time.perf_counter())
+        except RuntimeError:
+            # the pool was shut down by a concurrent drain(), the write is done in place
+            self._run(func, args, size, time.perf_counter())
+
+    def _run(self, func: Callable, args: tuple, size: int, queued_at: float):
+        started = time.perf_counter()
+        failed = False
+
+        try:
+            func(*args)
+        except Exception as e:
+            failed = True
+            print(f'[BLogger][ERROR] Background attachment write failed: {e}')
+        finally:
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._depth -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._written += 1
+                    self._bytes += size
+                self._wait_total += started - queued_at
+                self._write_total += finished - started
+                self._write_max = max(self._write_max, finished - started)
+
+            self._slots.release()
+
+    def drain(self):
+        """Blocks until every queued write is on disk"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self._written + self._failed
+            return {
+                'enabled': self.enabled,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queue_depth': self._depth,
+                'max_queue_depth': self._max_depth,
+                'submitted': self._submitted,
+                'written': self._written,
+                'failed': self._failed,
+                'bytes': self._bytes,
+                'avg_wait_ms': round(self._wait_total / done * 1000, 3) if done else 0,
+                'avg_write_ms': round(self._write_total / done * 1000, 3) if done else 0,
+                'max_write_ms': round(self._write_max * 1000, 3),
+            }
+
+    def _reset_stats(self):
+        self._depth = 0
+        self._max_depth = 0
+        self._submitted = 0
+        self._written = 0
+        self._failed = 0
+        self._bytes = 0
+        self._wait_total = 0.0
+        self._write_total = 0.0
+        self._write_max = 0.0
+
+
+attachment_writer = AttachmentWriter()
@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import json
 from enum import Enum
 from uuid import UUID
 from datetime import datetime, timedelta
@@ -22,13 +21,59 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+from b_logger.utils.file_ops import atomic_write
+from b_logger.utils.serializers import serializer
+
+
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _convert(value: Any):
+    # exact type check first: most values are plain scalars and skip the isinstance chain
+    if value.__class__ in _PLAIN_TYPES:
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, datetime, timedelta, Path)):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: _convert(v) for k, v in value.items()} if len(value) != 0 else None
+    if isinstance(value, list):
+        return [_convert(v) for v in value] if len(value) != 0 else None
+    if isinstance(value, set):
+        return list(value) if len(value) != 0 else None
+    return value
+
+
+_slot_fields_cache: dict[type, tuple[str, ...]] = {}
+
+
+def _slot_fields(cls: type) -> tuple[str, ...]:
+    """__slots__ names of a class and its parents, in definition order"""
+    fields = _slot_fields_cache.get(cls)
+    if fields is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            for name in ((slots,) if isinstance(slots, str) else slots):
+                if name not in ('__dict__', '__weakref__') and name not in names:
+                    names.append(name)
+        fields = _slot_fields_cache[cls] = tuple(names)
+    return fields
+
 
 class BaseDataModel:
-    indent = 4
-    sort_keys = False
+    """
+    Base for report entities: json (de)serialization for both plain and __slots__ models.
+    Empty containers and unset slots are serialized as None
+    """
+
+    __slots__ = ()
+
+    pretty = False
 
     def __str__(self) -> str:
-        return self.to_json()
+        return self.to_json(pretty=True)
 
     @staticmethod
     def custom_serializer(obj: Any):
@@ -50,45 +95,32 @@ class BaseDataModel:
             return vars(obj)
         return str(obj)
 
-    def to_json(self) -> str:
-        return json.dumps(self,
-                          default=self.custom_serializer,
-                          indent=self.indent,
-                          sort_keys=self.sort_keys
-                          )
-
-    def to_json_file(self, path: str):
-        full_path = f'{path}.json'
-        with open(full_path, "w", encoding="utf-8") as file:
-            json.dump(self,
-                      file,
-                      default=self.custom_serializer,
-                      indent=self.indent,
-                      sort_keys=self.sort_keys
-                      )
+    def to_json(self, pretty: bool = None) -> str:
+        return self.to_json_bytes(pretty).decode('utf-8')
+
+    def to_json_bytes(self, pretty: bool = None) -> bytes:
+        """Compact by default, pretty output is meant for final artifacts only"""
+        return serializer().dumps(self,
+                                  default=self.custom_serializer,
+                                  pretty=self.pretty if pretty is None else pretty
+                                  )
+
+    def to_json_file(self, path: str, pretty: bool = None):
+        atomic_write(f'{path}.json', self.to_json_bytes(pretty))
 
     def to_dict(self) -> dict:
-        def convert(value: Any):
-            if isinstance(value, Enum):
-                return value.value
-            if isinstance(value, (UUID, datetime, timedelta, Path)):
-                return str(value)
-            if isinstance(value, defaultdict):
-                return {k: convert(v) for k, v in value.items()} if len(value) != 0 else None
-            if isinstance(value, dict):
-                return {k: convert(v) for k, v in value.items()} if len(value) != 0 else None
-            if isinstance(value, list):
-                return [convert(v) for v in value] if len(value) != 0 else None
-            if isinstance(value, set):
-                return list(value) if len(value) != 0 else None
-            return value
-
-        return {k: convert(v) for k, v in self.__dict__.items()}
+        data = {k: _convert(getattr(self, k, None)) for k in _slot_fields(type(self))}
+
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict:
+            data.update((k, _convert(v)) for k, v in instance_dict.items())
+
+        return data
 
     @classmethod
     def from_json(cls, filepath: str):
-        with open(filepath, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        with open(filepath, "rb") as file:
+            data = serializer().loads(file.read())
         return cls.from_dict(data)
 
     @classmethod
@@ -103,7 +135,7 @@ class BaseDataModel:
                 obj[key] = value
             elif hasattr(obj, key):
                 setattr(obj, key, value)
-            else:
+            elif hasattr(obj, '__dict__'):
                 obj.__dict__[key] = value
 
         return obj
@@ -3,10 +3,20 @@ import importlib
 
 
 class BrowserAdapter(ABC):
+    # async adapters capture with `await make_screenshot_async()` inside the test's event loop
+    is_async = False
+
     @abstractmethod
-    def make_screenshot(self) -> bytes | None:
+    def make_screenshot(self) -> bytes | list | None:
         ...
 
+    async def make_screenshot_async(self) -> bytes | list | None:
+        return self.make_screenshot()
+
+    @classmethod
+    def is_valid(cls, obj) -> bool:
+        return False
+
 
 class SeleniumAdapter(BrowserAdapter):
     def __init__(self, driver):
@@ -22,8 +32,8 @@ class SeleniumAdapter(BrowserAdapter):
     @classmethod
     def is_valid(cls, obj) -> bool:
         try:
-            selenium_module = importlib.import_module("selenium.webdriver.ie.webdriver")
-            return isinstance(obj, (selenium_module.RemoteWebDriver, selenium_module.WebDriver))
+            # local drivers (Chrome, Firefox, ...) subclass the remote WebDriver
+            return isinstance(obj, importlib.import_module("selenium.webdriver.remote.webdriver").WebDriver)
         except ImportError:
             return False
 
@@ -33,44 +43,149 @@ class PlaywrightAdapter(BrowserAdapter):
         self.page = page
 
     def make_screenshot(self) -> bytes | list | None:
-        def try_screenshot(page):
-            try:
-                if page.is_closed():
-                    return None
+        try:
+            pages = [page
+                     for context in self.page.context.browser.contexts
+                     for page in context.pages
+                     if not page.is_closed()]
 
-                return page.screenshot(animations='disabled')
-            except Exception as e:
-                print(f'[BLogger][WARN] Screenshot failed on page: {getattr(page, "url", "?")}: {e}')
-                return None
+            screenshots = [self._try_screenshot(page) for page in pages]
+            scr_container = [scr for scr in screenshots if scr]
 
-        scr_container = []
+            return scr_container[0] if len(scr_container) == 1 else scr_container
+        except Exception as e:
+            print(f'[BLogger][WARN] Screenshot failed: {e}')
+
+    @staticmethod
+    def _try_screenshot(page) -> bytes | None:
+        try:
+            return page.screenshot(animations='disabled')
+        except Exception as e:
+            print(f'[BLogger][WARN] Screenshot failed on page: {getattr(page, "url", "?")}: {e}')
+            return None
 
+    @classmethod
+    def is_valid(cls, obj) -> bool:
         try:
-            for context in self.page.context.browser.contexts:
-                for page in context.pages:
-                    scr = try_screenshot(page)
-                    if scr:
-                        scr_container.append(scr)
+            page = importlib.import_module("playwright.sync_api").Page
+            return isinstance(obj, page)
+        except ImportError:
+            return False
 
-            return scr_container[0] if len(scr_container) == 1 else scr_container
+
+class AsyncPlaywrightAdapter(BrowserAdapter):
+    """
+    playwright.async_api Page. Pages of all contexts are captured at once with asyncio.gather.
+    Outside the event loop (pytest hooks after the test coroutine is done) the capture is run on the loop
+    the page was last used on by b_logger: the one blog.set_browser() or an awaited screenshot ran in.
+    A page that was never seen in its loop (set from a fixture value only) can't be captured synchronously
+    """
+    is_async = True
+
+    def __init__(self, page):
+        import asyncio
+
+        self.page = page
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+
+    def make_screenshot(self) -> bytes | list | None:
+        loop = self.loop
+        if loop is None or loop.is_running() or loop.is_closed():
+            print('[BLogger][WARN] Screenshot of an async Playwright page can\'t be made outside of its event loop, '
+                  'use `await blog.screenshot()` or `async with blog.step()`')
+            return None
+
+        return loop.run_until_complete(self.make_screenshot_async())
+
+    async def make_screenshot_async(self) -> bytes | list | None:
+        import asyncio
+
+        self.loop = asyncio.get_running_loop()
+        try:
+            pages = [page
+                     for context in self.page.context.browser.contexts
+                     for page in context.pages
+                     if not page.is_closed()]
+
+            results = await asyncio.gather(*(page.screenshot(animations='disabled') for page in pages),
+                                           return_exceptions=True)
         except Exception as e:
             print(f'[BLogger][WARN] Screenshot failed: {e}')
+            return None
+
+        scr_container = []
+        for page, result in zip(pages, results):
+            if isinstance(result, BaseException):
+                print(f'[BLogger][WARN] Screenshot failed on page: {getattr(page, "url", "?")}: {result}')
+            elif result:
+                scr_container.append(result)
+
+        return scr_container[0] if len(scr_container) == 1 else scr_container
 
     @classmethod
     def is_valid(cls, obj) -> bool:
         try:
-            page = importlib.import_module("playwright.sync_api").Page
+            page = importlib.import_module("playwright.async_api").Page
             return isinstance(obj, page)
         except ImportError:
             return False
 
 
-ADAPTERS = [SeleniumAdapter, PlaywrightAdapter]
+# probed in order with is_valid for browser types that are not registered
+ADAPTERS = [SeleniumAdapter, PlaywrightAdapter, AsyncPlaywrightAdapter]
+
+# browser type or its "module.QualName" -> adapter class
+_registry: dict[type | str, type[BrowserAdapter]] = {}
+
+# resolved adapter class per browser type, None for unsupported types
+_resolved: dict[type, type[BrowserAdapter] | None] = {}
+
+
+def register_adapter(adapter_cls: type[BrowserAdapter], *browser_types: type | str):
+    """
+    Adds an adapter for browser objects of other libraries (Appium, pyppeteer, async Playwright etc.)
+
+    browser_types - classes or "module.QualName" strings (matched without importing the library),
+    subclasses match too. Without browser_types adapter_cls.is_valid is probed before the built-in adapters
+
+    Usage:
+        register_adapter(AppiumAdapter, 'appium.webdriver.webdriver.WebDriver')
+    """
+    if browser_types:
+        for browser_type in browser_types:
+            _registry[browser_type] = adapter_cls
+    else:
+        ADAPTERS.insert(0, adapter_cls)
+    _resolved.clear()
+
+
+def adapter_class(browser) -> type[BrowserAdapter] | None:
+    """Adapter class for a browser object. Resolved once per browser type, is_valid is not called again"""
+    browser_type = type(browser)
+    try:
+        return _resolved[browser_type]
+    except KeyError:
+        pass
+
+    adapter_cls = _lookup_registry(browser_type)
+    if adapter_cls is None:
+        adapter_cls = next((cls for cls in ADAPTERS if cls.is_valid(browser)), None)
+        if adapter_cls is None:
+            print(f'[BLogger][WARN] Unsupported browser object {browser_type.__qualname__}, no screenshots will be made. '
+                  f'See browser_adapters.register_adapter')
 
+    _resolved[browser_type] = adapter_cls
+    return adapter_cls
 
-def get_browser_adapter(browser) -> BrowserAdapter:
-    for adapter_cls in ADAPTERS:
-        if adapter_cls.is_valid(browser):
-            return adapter_cls(browser)
 
-    raise RuntimeError(f"Unsupported browser object: {browser}")
+def _lookup_registry(browser_type: type) -> type[BrowserAdapter] | None:
+    if not _registry:
+        return None
+    for cls in browser_type.__mro__:
+        adapter_cls = _registry.get(cls) or _registry.get(f'{cls.__module__}.{cls.__qualname__}')
+        if adapter_cls is not None:
+            return adapter_cls
+    return None
@@ -0,0 +1,185 @@
+import heapq
+import json
+import os
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+# how many tests a node holds at once with duration scheduling: the running one and the next
+DURATION_PREFETCH = 2
+
+
+class DurationHistory:
+    """
+    Per-nodeid duration estimates kept between runs (exponential moving average of TestReport.duration)
+
+    Usage:
+        history = DurationHistory.resolve('.blog_durations.json')
+        estimates = history.load()
+        history.update(combined_report.iter_test_reports())
+    """
+
+    def __init__(self, path: str | Path, alpha: float = 0.5):
+        self.path = Path(path)
+        self.alpha = alpha
+
+    @staticmethod
+    def resolve(path: str) -> 'DurationHistory':
+        """Relative paths are resolved against project root"""
+        history_path = Path(path).expanduser()
+        if not history_path.is_absolute():
+            from b_logger.utils.paths import pathfinder
+            history_path = pathfinder.project_root() / history_path
+        return DurationHistory(history_path)
+
+    def load(self) -> dict[str, float]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {nodeid: float(value) for nodeid, value in json.load(f).get('durations', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f'[BLogger][WARN] Unable to read duration history {self.path}: {e}')
+            return {}
+
+    def update(self, test_reports: Iterable):
+        durations = self.load()
+
+        for test in test_reports:
+            nodeid, duration = test.get('nodeid'), test.get('duration')
+            if not nodeid or duration is None:
+                continue
+            previous = durations.get(nodeid)
+            durations[nodeid] = round(duration if previous is None
+                                      else self.alpha * duration + (1 - self.alpha) * previous, 4)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f'{self.path.name}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'durations': durations}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def estimate(nodeids: list[str], history: dict[str, float]) -> list[float]:
+    """Expected durations, tests without history get the median of known ones"""
+    known = sorted(history[nodeid] for nodeid in nodeids if nodeid in history)
+    default = known[len(known) // 2] if known else 0.0
+    return [history.get(nodeid, default) for nodeid in nodeids]
+
+
+def lpt_order(estimates: list[float]) -> list[int]:
+    """Indices, longest expected first. Stable, so without history collection order is kept"""
+    return sorted(range(len(estimates)), key=lambda i: -estimates[i])
+
+
+def simulate_prefetch(durations: list[float], order: list[int], nodes: int,
+                      prefetch: int = DURATION_PREFETCH) -> float:
+    """Makespan when each node holds up to `prefetch` tests and takes the next one from `order` as it frees up"""
+    pending = deque(order)
+    queues = [deque() for _ in range(nodes)]
+    for queue in queues:
+        while pending and len(queue) < prefetch:
+            queue.append(pending.popleft())
+
+    return _run_queues(durations, queues, lambda node, duration: _top_up(queues[node], pending, prefetch))
+
+
+def simulate_load_scheduling(durations: list[float], nodes: int, maxschedchunk: Optional[int] = None) -> float:
+    """Makespan of xdist LoadScheduling (`--dist load`) for tests in collection order"""
+    count = len(durations)
+    maxschedchunk = maxschedchunk or count
+    pending = deque(range(count))
+    queues = [deque() for _ in range(nodes)]
+
+    if count < 2 * nodes:
+        for i in range(count):
+            queues[i % nodes].append(pending.popleft())
+    else:
+        chunk = max(min(count // nodes // 4, maxschedchunk), 2)
+        for queue in queues:
+            for _ in range(min(chunk, len(pending))):
+                queue.append(pending.popleft())
+
+    def check_schedule(node: int, duration: float):
+        # mirrors LoadScheduling.check_schedule
+        queue = queues[node]
+        if not pending:
+            return
+        per_node_min = max(2, len(pending) // nodes // 4)
+        per_node_max = max(2, len(pending) // nodes // 2)
+        if len(queue) < per_node_min:
+            if duration >= 0.1 and len(queue) >= 2:
+                return
+            num_send = min(per_node_max - len(queue), max(2 - len(queue), maxschedchunk))
+            for _ in range(min(num_send, len(pending))):
+                queue.append(pending.popleft())
+
+    return _run_queues(durations, queues, check_schedule)
+
+
+def _top_up(queue: deque, pending: deque, prefetch: int):
+    while pending and len(queue) < prefetch:
+        queue.append(pending.popleft())
+
+
+def _run_queues(durations: list[float], queues: list[deque], on_complete) -> float:
+    """Every node runs the head of its queue, `on_complete(node, duration)` may add more tests"""
+    events = [(durations[queue[0]], node) for node, queue in enumerate(queues) if queue]
+    heapq.heapify(events)
+    makespan = 0.0
+
+    while events:
+        now, node = heapq.heappop(events)
+        makespan = max(makespan, now)
+        duration = durations[queues[node].popleft()]
+        on_complete(node, duration)
+        if queues[node]:
+            heapq.heappush(events, (now + durations[queues[node][0]], node))
+
+    return makespan
+
+
+def scheduling_summary(test_reports: Iterable, collection: list[str], history: dict[str, float]) -> Optional[dict]:
+    """
+    Wall-clock makespan of the run compared with an estimate for `--dist load` on the same test durations.
+    Makespan is the longest worker span, from the start of its first test to the end of its last one.
+    The estimate covers test durations only, so gain compares it with the busiest worker's sum of test durations
+    """
+    durations_by_id = {}
+    busy = defaultdict(float)
+    spans: dict[str, list[float]] = {}
+
+    for test in test_reports:
+        duration = test.get('duration') or 0.0
+        worker = test.get('worker') or 'master'
+        busy[worker] += duration
+        if test.get('nodeid'):
+            durations_by_id[test.get('nodeid')] = duration
+
+        start = test.get('start_time')
+        if start is not None:
+            span = spans.setdefault(worker, [start, start + duration])
+            span[0], span[1] = min(span[0], start), max(span[1], start + duration)
+
+    nodes = len(busy)
+    if nodes < 2 or not collection:
+        return None
+
+    durations = [durations_by_id.get(nodeid, 0.0) for nodeid in collection]
+    total = sum(durations)
+    busiest = max(busy.values())
+    makespan = max((end - start for start, end in spans.values()), default=busiest)
+    load_makespan = simulate_load_scheduling(durations, nodes)
+
+    return {
+        'scheduler': 'duration',
+        'workers': nodes,
+        'tests': len(collection),
+        'with_history': sum(1 for nodeid in collection if nodeid in history),
+        'makespan': round(makespan, 2),
+        'busiest': round(busiest, 2),
+        'load_makespan': round(load_makespan, 2),
+        'lower_bound': round(max(total / nodes, max(durations, default=0.0)), 2),
+        'gain': round((load_makespan - busiest) / load_makespan * 100, 1) if load_makespan else 0.0,
+        'busy': {worker: round(value, 2) for worker, value in sorted(busy.items())}
+    }
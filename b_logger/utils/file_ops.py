@@ -0,0 +1,94 @@
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+FICLONE = 0x40049409
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def atomic_write(path: str | Path, data: bytes):
+    """
+    Single-writer files: data goes to a temp file next to path and replaces it with os.replace,
+    readers see the old file or the new one, never a partial write. No lock files needed
+    """
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def same_filesystem(src: Path, dest_dir: Path) -> bool:
+    try:
+        return os.stat(src).st_dev == os.stat(dest_dir).st_dev
+    except OSError:
+        return False
+
+
+def hardlink(src: Path, dest: Path) -> bool:
+    """Links src into dest (dest may already exist). False if linking is not possible"""
+    tmp = dest.with_name(f'{dest.name}.{os.getpid()}.lnk')
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dest)
+        return True
+    except OSError:
+        if tmp.exists():
+            tmp.unlink()
+        return False
+
+
+def reflink(src: Path, dest: Path) -> bool:
+    """Copy-on-write clone (btrfs, xfs, ...). False if the filesystem can't do it"""
+    if fcntl is None:
+        return False
+
+    try:
+        with open(src, 'rb') as s, open(dest, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def copy_file(src: Path, dest: Path):
+    """In-kernel copy via copy_file_range where available, regular copy otherwise"""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as s, open(dest, 'wb') as d:
+                while os.copy_file_range(s.fileno(), d.fileno(), CHUNK_SIZE * 64):
+                    pass
+            return
+        except OSError:
+            pass
+
+    shutil.copyfile(src, dest)
+
+
+def stream_copy(file_obj: BinaryIO, dest: Path, on_chunk: Optional[Callable[[bytes], None]] = None) -> int:
+    """Copies a file-like object in chunks, so memory use doesn't depend on stream size. Returns bytes written"""
+    written = 0
+    with open(dest, 'wb') as f:
+        while True:
+            chunk = file_obj.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if on_chunk:
+                on_chunk(chunk)
+            f.write(chunk)
+            written += len(chunk)
+    return written
@@ -0,0 +1,12 @@
+import itertools
+import uuid
+
+# one random token per process (xdist worker), then a plain counter:
+# ids stay unique across workers without calling uuid4() for every step and print
+_process_token = uuid.uuid4().hex[:8]
+_counter = itertools.count(1)
+
+
+def next_id(prefix: str) -> str:
+    """e.g. step_1f2e3d4c_42. next() on itertools.count is atomic, so it is safe for threads"""
+    return f'{prefix}_{_process_token}_{next(_counter)}'
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+from b_logger.utils.basedatamodel import BaseDataModel
+from b_logger.utils.serializers import serializer
+
+
+class ReportJournal:
+    """
+    Append-only NDJSON log of finished TestReports, one file per worker
+
+    Every record is flushed to the OS right away, so a crashed worker loses nothing,
+    and fsync is batched to every `fsync_every` records to keep per-test cost constant.
+
+    Usage:
+        journal = ReportJournal(ReportJournal.path_for(report_path))
+        journal.append(test_report)
+        journal.close()
+
+        for record in ReportJournal.read(journal_path):
+            ...
+    """
+
+    suffix = '.ndjson'
+
+    def __init__(self, path: str, fsync_every: int = 50):
+        self.path = path
+        self.fsync_every = max(int(fsync_every or 1), 1)
+        self._pending = 0
+        self._file = open(path, 'ab')
+
+    @classmethod
+    def path_for(cls, report_path: str) -> str:
+        """Journal path that belongs to a report file (with or without .json extension)"""
+        path = Path(report_path)
+        if path.suffix == '.json':
+            path = path.with_suffix('')
+        return f'{path}{cls.suffix}'
+
+    def append(self, test_report) -> int:
+        """Returns offset of the record in the journal file"""
+        line = serializer().dumps(test_report, default=BaseDataModel.custom_serializer)
+        offset = self._file.tell()
+        self._file.write(line + b'\n')
+        self._file.flush()
+
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+        return offset
+
+    def sync(self):
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict]:
+        """Yields journal records, skipping a torn last line left by a crashed worker"""
+        with open(path, 'rb') as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield serializer().loads(line)
+                except ValueError:
+                    print(f'[BLogger][WARN] Skipping corrupted journal record {path}:{line_no}')
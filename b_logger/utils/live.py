@@ -0,0 +1,96 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+from b_logger.entities.statuses import TestStatus
+from b_logger.utils.paths import b_logs_path, live_path, templates_path
+from b_logger.utils.serializers import serializer
+
+
+class LiveFeed:
+    """
+    Append-only feed of run progress for blog_live.html, shared by all workers
+
+    Every delta is a single `blogLive({...});` line written with one os.write() on an O_APPEND descriptor,
+    so lines of different workers never interleave. The page reloads the file with a <script> tag
+    (works from file:// too) and applies only the deltas it hasn't seen yet.
+
+    Deltas:
+        start  - worker collected `total` tests
+        test   - test finished: module, name, status, duration, error and stacktrace of failed tests
+        finish - report is generated, page stops polling
+
+    Usage:
+        LiveFeed.init()  # main worker, before tests start
+        feed = LiveFeed(worker)
+        feed.start(total)
+        feed.add_test(test_report)
+        feed.finish()
+        feed.close()
+    """
+
+    file_name = 'deltas.js'
+    page_name = 'blog_live.html'
+
+    def __init__(self, worker: str):
+        self.worker = worker
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(self.path(), flags, 0o644)
+
+    @classmethod
+    def path(cls) -> str:
+        return f'{live_path()}/{cls.file_name}'
+
+    @classmethod
+    def init(cls):
+        """Creates an empty feed and puts blog_live.html into b_logs"""
+        os.makedirs(live_path(), exist_ok=True)
+        Path(cls.path()).write_bytes(b'')
+
+        src = templates_path() / 'live.html'
+        if src.exists():
+            shutil.copyfile(src, f'{b_logs_path()}/{cls.page_name}')
+        else:
+            print(f'[BLogger][WARN] static file not found: {src}')
+
+    def start(self, total: int):
+        self._write({'type': 'start', 'total': total})
+
+    def add_test(self, test_report):
+        delta = {
+            'type': 'test',
+            'module': test_report.module,
+            'name': test_report.name,
+            'status': test_report.status,
+            'duration': test_report.duration,
+            'execution_count': test_report.execution_count
+        }
+
+        if test_report.status in (TestStatus.FAILED, TestStatus.BROKEN):
+            delta['error'] = test_report.error
+            delta['stacktrace'] = test_report.stacktrace
+
+        self._write(delta)
+
+    def finish(self, report: str = 'blog_report.html'):
+        self._write({'type': 'finish', 'report': report})
+
+    def _write(self, delta: dict):
+        if self._fd is None:
+            return
+
+        delta['worker'] = self.worker
+        delta['time'] = round(time.time(), 3)
+        line = b'blogLive(' + serializer().dumps(delta) + b');\n'
+
+        try:
+            os.write(self._fd, line)
+        except OSError as e:
+            print(f'[BLogger][WARN] Unable to write live report delta: {e}')
+
+    def close(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
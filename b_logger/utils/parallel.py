@@ -0,0 +1,68 @@
+import os
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def resolve_workers(workers: int) -> int:
+    """0 or less means one worker per CPU"""
+    workers = int(workers or 0)
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def parallel_map(func: Callable[[T], R], items: Iterable[T], workers: int = 1) -> list[R]:
+    """
+    Ordered map over a process pool. `func` must be a module level function.
+
+    Runs serially for a single worker or a single item,
+    and falls back to serial run when the pool can't be started (e.g. no multiprocessing support)
+    or breaks on the way (e.g. a merge process killed by OOM): items without a result are re-run serially
+    """
+    items = list(items)
+    workers = min(resolve_workers(workers), len(items))
+
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    chunksize = max(len(items) // (workers * 4), 1)
+
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError, ImportError) as e:
+        print(f'[BLogger][WARN] Unable to start process pool, merging serially: {e}')
+        return [func(item) for item in items]
+
+    results = []
+    try:
+        with executor:
+            for result in executor.map(func, items, chunksize=chunksize):
+                results.append(result)
+    except BrokenProcessPool as e:
+        print(f'[BLogger][WARN] Process pool broke, merging {len(items) - len(results)} remaining items serially: {e}')
+        results.extend(func(item) for item in items[len(results):])
+
+    return results
+
+
+def tree_reduce(items: list[T], combine: Callable[[T, T], T]) -> T | None:
+    """
+    Pairwise reduction: ((a+b)+(c+d))+... Keeps the order of items,
+    so combining lists gives the same result as a left-to-right fold
+    """
+    items = list(items)
+    if not items:
+        return None
+
+    while len(items) > 1:
+        reduced = [combine(items[i], items[i + 1]) for i in range(0, len(items) - 1, 2)]
+        if len(items) % 2:
+            reduced.append(items[-1])
+        items = reduced
+
+    return items[0]
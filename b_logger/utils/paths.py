@@ -122,7 +122,7 @@ def init_dirs():
     clear_b_logs_tmp()
 
     for filename in ("scripts.js", "styles.css", "icon.svg"):
-        src = Path(pathfinder.library_root()) / f'b_logger/templates/{filename}'
+        src = templates_path() / filename
         dst = Path(static_path()) / filename
 
         if src.exists():
@@ -140,43 +140,84 @@ def clear_directory(directory: str, rmdir=False):
         if entry.is_file() or entry.is_symlink():
             entry.unlink()
         elif entry.is_dir():
-            clear_directory(str(entry))
-
-        if rmdir:
-            entry.rmdir()
+            clear_directory(str(entry), rmdir)
 
     if rmdir:
         dir_path.rmdir()
 
 
+_b_logs_dir: Optional[str] = None
+
+
+def set_b_logs_dir(path: Optional[Union[str, Path]]):
+    """
+    Sets b_logs location (b_logs_dir option), relative paths are resolved against project root.
+    None - <project root>/b_logs. Tmp dir is always next to it: <b_logs dir>_tmp
+    """
+    global _b_logs_dir
+    _b_logs_dir = str(path) if path else None
+    clear_path_cache()
+
+
+def clear_path_cache():
+    for func in (b_logs_path, attachments_path, static_path, data_path, live_path,
+                 b_logs_tmp_path, b_logs_tmp_reports_path, b_logs_tmp_steps_path, b_logs_tmp_overhead_path):
+        func.cache_clear()
+
+
 @lru_cache(maxsize=1)
 def b_logs_path():
-    return pathfinder.find('b_logs')
+    if _b_logs_dir is None:
+        return str(pathfinder.project_root() / 'b_logs')
+
+    path = Path(_b_logs_dir).expanduser()
+    if not path.is_absolute():
+        path = pathfinder.project_root() / path
+    return str(path.resolve())
 
 
 @lru_cache(maxsize=1)
 def attachments_path():
-    return pathfinder.find('b_logs/attachments')
+    return f'{b_logs_path()}/attachments'
 
 
 @lru_cache(maxsize=1)
 def static_path():
-    return pathfinder.find('b_logs/static')
+    return f'{b_logs_path()}/static'
+
+
+@lru_cache(maxsize=1)
+def data_path():
+    return f'{b_logs_path()}/data'
+
+
+@lru_cache(maxsize=1)
+def live_path():
+    return f'{b_logs_path()}/live'
 
 
 @lru_cache(maxsize=1)
 def b_logs_tmp_path():
-    return pathfinder.find('b_logs_tmp')
+    return f'{b_logs_path()}_tmp'
 
 
 @lru_cache(maxsize=1)
 def b_logs_tmp_reports_path():
-    return pathfinder.find('b_logs_tmp/reports')
+    return f'{b_logs_tmp_path()}/reports'
 
 
 @lru_cache(maxsize=1)
 def b_logs_tmp_steps_path():
-    return pathfinder.find('b_logs_tmp/steps')
+    return f'{b_logs_tmp_path()}/steps'
+
+
+@lru_cache(maxsize=1)
+def b_logs_tmp_overhead_path():
+    return f'{b_logs_tmp_path()}/overhead'
+
+
+def templates_path() -> Path:
+    return Path(__file__).resolve().parent.parent / 'templates'
 
 
 def clear_b_logs():
@@ -0,0 +1,235 @@
+import json
+import os
+import time
+from collections import defaultdict
+from functools import wraps
+from glob import glob
+
+from b_logger.utils.paths import b_logs_path, b_logs_tmp_overhead_path
+
+SESSION = '<session>'
+TOP_TESTS = 10
+
+
+class OverheadProfiler:
+    """
+    Self time of b_logger internals per test and per phase, measured with perf_counter_ns.
+    Nested profiled calls are subtracted from the caller, so phase times add up to the total overhead.
+
+    install() wraps the profiled methods, while profiling is off nothing is wrapped and nothing is measured.
+    Only the test thread is profiled: background attachment writes are reported by pytest_blog_attachment_stats
+
+    Usage:
+        profiler.install()
+        ...
+        profiler.save(worker)
+    """
+
+    def __init__(self):
+        self.installed = False
+        self._originals = []
+        self.reset()
+
+    def reset(self):
+        self.current = SESSION
+        # test -> phase -> [calls, self time ns]
+        self.tests: dict[str, dict[str, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        self.durations: dict[str, float] = {}
+        self._children: list[int] = []
+        self._test_started = 0
+
+    def install(self):
+        if self.installed:
+            return
+
+        for owner, name, phase in _targets():
+            raw = owner.__dict__[name]
+            if isinstance(raw, staticmethod):
+                wrapped = staticmethod(self.timed(phase, raw.__func__))
+            elif isinstance(raw, classmethod):
+                wrapped = classmethod(self.timed(phase, raw.__func__))
+            elif name == 'start_test':
+                wrapped = self._wrap_start_test(self.timed(phase, raw))
+            elif name == 'finish_test':
+                wrapped = self._wrap_finish_test(self.timed(phase, raw))
+            else:
+                wrapped = self.timed(phase, raw)
+
+            self._originals.append((owner, name, raw))
+            setattr(owner, name, wrapped)
+
+        self.installed = True
+
+    def uninstall(self):
+        for owner, name, raw in reversed(self._originals):
+            setattr(owner, name, raw)
+        self._originals.clear()
+        self.installed = False
+
+    def timed(self, phase: str, func):
+        children = self._children
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            children.append(0)
+            started = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - started
+                child_time = children.pop()
+                if children:
+                    children[-1] += elapsed
+
+                entry = self.tests[self.current][phase]
+                entry[0] += 1
+                entry[1] += elapsed - child_time
+
+        return wrapper
+
+    def _wrap_start_test(self, timed):
+        @wraps(timed)
+        def wrapper(runtime, item, *args, **kwargs):
+            self.current = item.nodeid
+            self._test_started = time.perf_counter_ns()
+            return timed(runtime, item, *args, **kwargs)
+
+        return wrapper
+
+    def _wrap_finish_test(self, timed):
+        """Test time is wall time from start_test to the end of finish_test: setup, call and teardown"""
+        @wraps(timed)
+        def wrapper(runtime, *args, **kwargs):
+            try:
+                return timed(runtime, *args, **kwargs)
+            finally:
+                self.durations[self.current] = (time.perf_counter_ns() - self._test_started) / 1e9
+                self.current = SESSION
+
+        return wrapper
+
+    def report(self, worker: str) -> dict:
+        tests = {}
+        for test, phases in self.tests.items():
+            total_ns = sum(ns for _, ns in phases.values())
+            duration = self.durations.get(test)
+            tests[test] = {
+                'total_ms': _ms(total_ns),
+                'duration_s': round(duration, 6) if duration is not None else None,
+                'share': round(total_ns / 1e9 / duration * 100, 2) if duration else None,
+                'phases': {phase: {'calls': calls, 'ms': _ms(ns)} for phase, (calls, ns) in sorted(phases.items())},
+            }
+
+        return {'worker': worker, 'phases': _phase_totals(tests.values()), 'tests': tests}
+
+    def save(self, worker: str):
+        os.makedirs(b_logs_tmp_overhead_path(), exist_ok=True)
+        with open(f'{b_logs_tmp_overhead_path()}/{worker}.json', 'w', encoding='utf-8') as f:
+            json.dump(self.report(worker), f)
+
+
+def collect_overhead() -> dict | None:
+    """
+    Merges worker profiles into b_logs/blog_overhead.json (every test),
+    returns the summary shown in blog_summary.html (phases, workers, tests with the highest overhead)
+    """
+    workers = []
+    for path in sorted(glob(f'{b_logs_tmp_overhead_path()}/*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                workers.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f'[BLogger][WARN] Unable to read overhead profile {path}: {e}')
+
+    if not workers:
+        return None
+
+    tests = [(worker['worker'], test, values)
+             for worker in workers
+             for test, values in worker['tests'].items()]
+    profiled_tests = [values for _, test, values in tests if test != SESSION]
+
+    total_ms = round(sum(values['total_ms'] for _, _, values in tests), 3)
+    tests_ms = sum(values['total_ms'] for values in profiled_tests)
+    test_time = sum(values['duration_s'] or 0 for values in profiled_tests)
+
+    summary = {
+        'total_ms': total_ms,
+        'session_ms': round(total_ms - tests_ms, 3),
+        'tests': len(profiled_tests),
+        'avg_test_ms': round(tests_ms / len(profiled_tests), 3) if profiled_tests else 0,
+        # overhead inside tests against their wall time, session work (worker report save) is left out
+        'share': round(tests_ms / 1000 / test_time * 100, 2) if test_time else None,
+        'phases': _phase_totals(values for _, _, values in tests),
+        'workers': {
+            worker['worker']: round(sum(values['total_ms'] for values in worker['tests'].values()), 3)
+            for worker in workers
+        },
+        'top_tests': [
+            {'worker': worker, 'test': test, 'total_ms': values['total_ms'], 'share': values['share']}
+            for worker, test, values in sorted(tests, key=lambda t: -t[2]['total_ms'])
+            if test != SESSION
+        ][:TOP_TESTS],
+    }
+
+    with open(f'{b_logs_path()}/blog_overhead.json', 'w', encoding='utf-8') as f:
+        json.dump({**summary, 'per_worker': workers}, f, indent=1)
+
+    return summary
+
+
+def _phase_totals(tests) -> dict:
+    totals = defaultdict(lambda: [0, 0.0])
+    for test in tests:
+        for phase, values in test['phases'].items():
+            totals[phase][0] += values['calls']
+            totals[phase][1] += values['ms']
+
+    return {
+        phase: {'calls': calls, 'total_ms': round(ms, 3), 'avg_us': round(ms / calls * 1000, 1) if calls else 0}
+        for phase, (calls, ms) in sorted(totals.items(), key=lambda item: -item[1][1])
+    }
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1e6, 3)
+
+
+def _targets() -> list[tuple[type, str, str]]:
+    """(owner, attribute, phase) of every profiled call"""
+    from b_logger.entities.attachments import Attachment
+    from b_logger.entities.reports import RunReport
+    from b_logger.integrations import Integrations
+    from b_logger.runtime import RunTime
+    from b_logger.utils import browser_adapters
+    from b_logger.utils.journal import ReportJournal
+    from b_logger.utils.steps_store import StepsWriter
+
+    targets = [
+        (RunTime, 'start_test', 'RunTime.start_test'),
+        (RunTime, 'finish_test', 'RunTime.finish_test'),
+        (RunTime, 'start_step', 'steps'),
+        (RunTime, 'handle_step_result', 'steps'),
+        (RunTime, 'finish_step', 'steps'),
+        (RunTime, 'apply_info', 'RunTime.apply_info'),
+        (RunTime, 'print_message', 'RunTime.print_message'),
+        (RunTime, 'attach', 'RunTime.attach'),
+        (RunTime, '_take_screenshots', 'screenshots'),
+        (StepsWriter, 'append', 'StepsWriter.append'),
+        (RunReport, 'save_json', 'RunReport.save_json'),
+        (ReportJournal, 'append', 'ReportJournal.append'),
+        (Attachment, '_process', 'Attachment._process'),
+        (Attachment, 'from_encoded_bytes', 'Attachment._process'),
+        (Integrations, 'flush', 'integrations'),
+        (Integrations, '_send', 'integrations'),
+    ]
+
+    adapters = set(browser_adapters.ADAPTERS) | set(browser_adapters._registry.values())
+    for adapter_cls in sorted(adapters, key=lambda cls: cls.__name__):
+        if 'make_screenshot' in adapter_cls.__dict__:
+            targets.append((adapter_cls, 'make_screenshot', f'{adapter_cls.__name__}.make_screenshot'))
+
+    return targets
+
+
+profiler = OverheadProfiler()
@@ -6,6 +6,25 @@ class BlogPyAddons:
         group.addoption('--blog-project-name', default=None, action='store', help='Change project name for the entire Run')
         group.addoption('--blog-env', default=None, action='store', help='Set env for the entire Run')
         group.addoption('--blog-base-url', default=None, action='store', help='Set base url for the entire Run')
+        group.addoption('--blog-b-logs-dir', default=None, action='store',
+                        help='Directory for b_logs, relative to project root or absolute. Default: <project root>/b_logs')
+        group.addoption('--blog-report-mode', default=None, action='store', choices=['full', 'lazy'],
+                        help='full - all steps are rendered into blog_report.html, '
+                             'lazy - steps are loaded from b_logs/data when a test is expanded')
+        group.addoption('--blog-merge-workers', default=None, action='store', type=int,
+                        help='Number of processes used to merge worker reports, 0 - one per CPU')
+        group.addoption('--blog-steps-compression', default=None, action='store', choices=['none', 'gzip', 'zstd'],
+                        help='Compression of the packed per-worker steps files, zstd needs Python 3.14+ or zstandard')
+        group.addoption('--blog-live-report', default=None, action='store_true',
+                        help='Show progress and failures in b_logs/blog_live.html while tests are running')
+        group.addoption('--blog-archive-dir', default=None, action='store',
+                        help='Append results of the run to a columnar archive in this directory, see blog-archive CLI')
+        group.addoption('--blog-duration-scheduling', default=None, action='store_true',
+                        help='xdist: run the longest tests first based on duration history, so workers finish together')
+        group.addoption('--blog-screenshot-format', default=None, action='store', choices=['png', 'webp', 'jpeg'],
+                        help='Format screenshots are saved in, webp and jpeg need Pillow')
+        group.addoption('--blog-profile', default=None, action='store_true',
+                        help='Measure b_logger overhead per test, see b_logs/blog_overhead.json and blog_summary.html')
 
     @staticmethod
     def add_blog_markers(config):
@@ -0,0 +1,255 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from collections import Counter
+from typing import Optional
+
+from b_logger.config import blog_config
+from b_logger.entities.attachments import Attachment
+
+FORMATS = {
+    'png': ('.png', 'image/png', 'PNG'),
+    'webp': ('.webp', 'image/webp', 'WEBP'),
+    'jpeg': ('.jpg', 'image/jpeg', 'JPEG'),
+}
+
+
+class ScreenshotEncoder:
+    """
+    Re-encodes captured PNGs: WebP/JPEG with `quality`, downscaled to `max_size` px on the longest side.
+    Runs on the attachment writer pool (with or without async_attachments), so the test thread only captures.
+    Needs Pillow, without it screenshots are kept as captured PNGs
+    """
+
+    def __init__(self, format_: str = 'png', quality: int = 80, max_size: int = 0):
+        self.format = format_
+        self.quality = int(quality)
+        self.max_size = int(max_size or 0)
+        self.ext, self.mime, self.pil_format = FORMATS[format_]
+
+    @property
+    def needed(self) -> bool:
+        return self.format != 'png' or self.max_size > 0
+
+    def encode(self, png: bytes) -> bytes:
+        started = time.perf_counter()
+        try:
+            from PIL import Image
+
+            with Image.open(io.BytesIO(png)) as image:
+                if self.max_size and max(image.size) > self.max_size:
+                    image.thumbnail((self.max_size, self.max_size), Image.LANCZOS)
+
+                if self.pil_format == 'JPEG' and image.mode != 'RGB':
+                    image = image.convert('RGB')
+
+                out = io.BytesIO()
+                if self.pil_format == 'PNG':
+                    image.save(out, format='PNG', optimize=True)
+                else:
+                    image.save(out, format=self.pil_format, quality=self.quality)
+
+            data = out.getvalue()
+        except Exception as e:
+            # the file still gets the captured image, browsers sniff the real type
+            print(f'[BLogger][WARN] Unable to encode screenshot, PNG is saved: {e}')
+            data = png
+
+        screenshot_stats.add_encode(time.perf_counter() - started, len(png), len(data))
+        return data
+
+
+class ScreenshotStats:
+    """Capture and encode timings, passed to pytest_blog_screenshot_stats at session finish"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.captures = []
+        self.encodes = []
+        self.skipped = Counter()
+
+    def add_capture(self, name: str, seconds: float, images: int):
+        with self._lock:
+            self.captures.append({'name': name, 'capture_ms': round(seconds * 1000, 3), 'images': images})
+
+    def add_encode(self, seconds: float, size_in: int, size_out: int):
+        with self._lock:
+            self.encodes.append({'encode_ms': round(seconds * 1000, 3), 'bytes_in': size_in, 'bytes_out': size_out})
+
+    def add_skip(self, reason: str):
+        with self._lock:
+            self.skipped[reason] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            capture_ms = [c['capture_ms'] for c in self.captures]
+            encode_ms = [e['encode_ms'] for e in self.encodes]
+            return {
+                'format': encoder().format,
+                'captures': len(self.captures),
+                'images': sum(c['images'] for c in self.captures),
+                'avg_capture_ms': round(sum(capture_ms) / len(capture_ms), 3) if capture_ms else 0,
+                'max_capture_ms': max(capture_ms, default=0),
+                'encoded': len(self.encodes),
+                'avg_encode_ms': round(sum(encode_ms) / len(encode_ms), 3) if encode_ms else 0,
+                'max_encode_ms': max(encode_ms, default=0),
+                'bytes_in': sum(e['bytes_in'] for e in self.encodes),
+                'bytes_out': sum(e['bytes_out'] for e in self.encodes),
+                'skipped': dict(self.skipped),
+                'per_capture': list(self.captures),
+            }
+
+
+screenshot_stats = ScreenshotStats()
+
+
+@lru_cache(maxsize=1)
+def encoder() -> ScreenshotEncoder:
+    screenshot_encoder = ScreenshotEncoder(blog_config.screenshot_format,
+                                           blog_config.screenshot_quality,
+                                           blog_config.screenshot_max_size)
+
+    if screenshot_encoder.needed:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print('[BLogger][WARN] screenshot_format/screenshot_max_size need Pillow (pip install pillow), '
+                  'screenshots are saved as PNG')
+            return ScreenshotEncoder()
+
+    return screenshot_encoder
+
+
+def screenshot_attachment(png: bytes, name: Optional[str] = None) -> Attachment:
+    """Attachment for a captured PNG. Encoding and writing are done by the attachment writer"""
+    screenshot_encoder = encoder()
+
+    if name:
+        name = str(Path(name).with_suffix(screenshot_encoder.ext))
+
+    if not screenshot_encoder.needed:
+        return Attachment(png, name=name)
+
+    return Attachment.from_encoded_bytes(png, name, screenshot_encoder.mime, screenshot_encoder.ext,
+                                         screenshot_encoder.encode)
+
+
+def image_hash(png: bytes) -> tuple[str, int]:
+    """
+    dHash: 9x8 grayscale thumbnail, a bit per horizontal neighbour comparison.
+    A blinking caret or a spinner changes a few bits at most, other content changes many.
+    Without Pillow (or for an undecodable image) a content hash is used, so only equal bytes match
+    """
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(png)) as image:
+            pixels = image.resize((9, 8), Image.BOX, reducing_gap=2.0).convert('L').tobytes()
+    except Exception:
+        return 'exact', int.from_bytes(hashlib.blake2b(png, digest_size=8).digest(), 'big')
+
+    bits = 0
+    for row in range(0, 72, 9):
+        for col in range(8):
+            bits = bits << 1 | (pixels[row + col] > pixels[row + col + 1])
+    return 'dhash', bits
+
+
+class ScreenshotPolicy:
+    """
+    Limits screenshots of a worker session:
+        - per_test / per_session: number of captures, checked before capturing
+        - max_bytes: captured PNG bytes, stored screenshots stop once the budget is used up
+        - dedup: a screenshot within `dedup_distance` bits (dHash) of the previous one of the same page is not stored
+    A skipped screenshot is recorded as a duplicate of the previous screenshot of the page, when there is one.
+    Pages are those of the current browser: forget_pages() is called whenever the browser changes
+    """
+
+    def __init__(self, per_test: int = 0, per_session: int = 0, max_bytes: int = 0,
+                 dedup: bool = False, dedup_distance: int = 4):
+        self.per_test = per_test
+        self.per_session = per_session
+        self.max_bytes = max_bytes
+        self.dedup = dedup
+        self.dedup_distance = dedup_distance
+
+        self.test_count = 0
+        self.session_count = 0
+        self.bytes_used = 0
+        self.bytes_exhausted = False
+        # page index -> (image hash, stored attachment)
+        self._last: dict[int, tuple[Optional[tuple[str, int]], Attachment]] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.per_test or self.per_session or self.max_bytes or self.dedup)
+
+    def start_test(self):
+        self.test_count = 0
+
+    def forget_pages(self):
+        self._last.clear()
+
+    def acquire(self) -> Optional[str]:
+        """Counts a capture. Returns the reason to skip it instead, when a limit is reached"""
+        if self.per_test and self.test_count >= self.per_test:
+            return 'test_limit'
+        if self.per_session and self.session_count >= self.per_session:
+            return 'session_limit'
+        if self.bytes_exhausted:
+            return 'bytes_limit'
+
+        self.test_count += 1
+        self.session_count += 1
+        return None
+
+    def skip(self, reason: str) -> list[Attachment]:
+        """Duplicates of the previous screenshots of the browser pages for a capture that was not made"""
+        screenshot_stats.add_skip(reason)
+        return [Attachment.duplicate_of(attachment) for _, (_, attachment) in sorted(self._last.items())]
+
+    def store(self, page: int, png: bytes,
+              name: Optional[str] = None) -> tuple[Optional[Attachment], Optional[bytes]]:
+        """
+        Attachment and PNG of a captured page.
+        PNG is None for a duplicate of an earlier screenshot, both are None when nothing is stored
+        """
+        if not self.active:
+            return screenshot_attachment(png, name), png
+
+        last_hash, last = self._last.get(page, (None, None))
+        png_hash = image_hash(png) if self.dedup else None
+
+        if last is not None and png_hash is not None and last_hash is not None and png_hash[0] == last_hash[0]:
+            distance = bin(png_hash[1] ^ last_hash[1]).count('1')
+            if distance <= (self.dedup_distance if png_hash[0] == 'dhash' else 0):
+                screenshot_stats.add_skip('duplicate')
+                return Attachment.duplicate_of(last), None
+
+        if self.max_bytes and self.bytes_used + len(png) > self.max_bytes:
+            self.bytes_exhausted = True
+            screenshot_stats.add_skip('bytes_limit')
+            return (Attachment.duplicate_of(last) if last is not None else None), None
+
+        self.bytes_used += len(png)
+        attachment = screenshot_attachment(png, name)
+        self._last[page] = (png_hash, attachment)
+        return attachment, png
+
+
+@lru_cache(maxsize=1)
+def policy() -> ScreenshotPolicy:
+    """Worker policy from config, the per run byte budget is split between xdist workers"""
+    workers = max(int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1)), 1)
+    return ScreenshotPolicy(per_test=blog_config.screenshots_per_test,
+                            per_session=blog_config.screenshots_per_session,
+                            max_bytes=int(blog_config.screenshot_max_total_mb * 1024 * 1024 / workers),
+                            dedup=blog_config.screenshot_dedup,
+                            dedup_distance=blog_config.screenshot_dedup_distance)
@@ -0,0 +1,112 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+
+class JsonSerializer:
+    """
+    Serializer backend interface and stdlib fallback
+
+    dumps() returns UTF-8 bytes: compact by default, indented with pretty=True.
+    Pretty output (only blog_report.json) is always written by stdlib json, so it doesn't depend on the installed backend.
+    `default` is called for objects the backend can't encode natively (BaseDataModel.custom_serializer).
+    loads() raises ValueError on malformed data with any backend
+
+    Usage:
+        serializer = get_serializer('auto')
+        data = serializer.dumps(obj, default=BaseDataModel.custom_serializer)
+        obj = serializer.loads(data)
+    """
+
+    name = 'json'
+
+    def dumps(self, obj: Any, default: Optional[Callable] = None, pretty: bool = False) -> bytes:
+        if pretty:
+            text = json.dumps(obj, default=default, indent=4, ensure_ascii=False)
+        else:
+            text = json.dumps(obj, default=default, separators=(',', ':'), ensure_ascii=False)
+        return text.encode('utf-8')
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        # datetime goes through `default` as with stdlib json, so reports look the same with any backend
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any, default: Optional[Callable] = None, pretty: bool = False) -> bytes:
+        if pretty:
+            return super().dumps(obj, default=default, pretty=True)
+        return self._orjson.dumps(obj, default=default, option=self._options)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecSerializer(JsonSerializer):
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoders: dict[Callable | None, Any] = {}
+
+    def dumps(self, obj: Any, default: Optional[Callable] = None, pretty: bool = False) -> bytes:
+        if pretty:
+            return super().dumps(obj, default=default, pretty=True)
+
+        encoder = self._encoders.get(default)
+        if encoder is None:
+            encoder = self._encoders[default] = self._msgspec.json.Encoder(enc_hook=default)
+
+        return encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+BACKENDS = {
+    'orjson': OrjsonSerializer,
+    'msgspec': MsgspecSerializer,
+    'json': JsonSerializer,
+}
+
+
+def get_serializer(name: str = 'auto') -> JsonSerializer:
+    """
+    'auto' picks the first installed backend: orjson > msgspec > json.
+    A named backend that is not installed falls back to stdlib json with a warning
+    """
+    if name == 'auto':
+        for backend in BACKENDS.values():
+            try:
+                return backend()
+            except ImportError:
+                continue
+
+    if name not in BACKENDS:
+        print(f'[BLogger][WARN] Unknown json_backend "{name}", "json" is used. Available: {("auto", *BACKENDS)}')
+        return JsonSerializer()
+
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        print(f'[BLogger][WARN] json_backend "{name}" is not installed, "json" is used')
+        return JsonSerializer()
+
+
+@lru_cache(maxsize=1)
+def serializer() -> JsonSerializer:
+    """Backend selected by `json_backend` in blog.config.yaml"""
+    from b_logger.config import blog_config
+    return get_serializer(blog_config.json_backend)
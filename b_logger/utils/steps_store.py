@@ -0,0 +1,249 @@
+import struct
+from functools import lru_cache
+from glob import glob
+from typing import Callable, Iterator
+
+from b_logger.entities.steps import StepContainer
+from b_logger.utils.paths import b_logs_tmp_steps_path
+from b_logger.utils.serializers import serializer
+
+MAGIC = b'BLSTEPS1'
+INDEX_MAGIC = b'BLSINDEX'
+CODECS = ('none', 'gzip', 'zstd')
+
+# segment header: magic, codec
+HEADER = struct.Struct('<8sB')
+# record: key length, payload length. Key is [nodeid, attempt id] json, payload is the compressed container json
+RECORD = struct.Struct('<II')
+# written by close(): offset of the index, magic
+FOOTER = struct.Struct('<Q8s')
+
+
+@lru_cache(maxsize=None)
+def codec(name: str) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """(compress, decompress) of a codec. zstd is taken from compression.zstd (3.14+) or the zstandard package"""
+    if name == 'gzip':
+        import gzip
+        return lambda data: gzip.compress(data, compresslevel=1, mtime=0), gzip.decompress
+
+    if name == 'zstd':
+        try:
+            from compression import zstd
+            return lambda data: zstd.compress(data, level=3), zstd.decompress
+        except ImportError:
+            import zstandard
+            return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+
+    return _identity, _identity
+
+
+def _identity(data: bytes) -> bytes:
+    return data
+
+
+def writer_codec(name: str) -> str:
+    """Codec a segment is written with: zstd falls back to gzip when no zstd module is available"""
+    if name == 'zstd':
+        try:
+            codec('zstd')
+        except ImportError:
+            print('[BLogger][WARN] steps_compression: zstd needs Python 3.14+ or zstandard (pip install zstandard), '
+                  'gzip is used')
+            return 'gzip'
+    return name if name in CODECS else 'none'
+
+
+class StepsWriter:
+    """
+    Step containers of a worker packed into one segment file instead of a json file per test attempt
+
+    `<name>.steps`: header (magic, codec), then a length-prefixed record per attempt:
+    [nodeid, attempt id] key and the container json, compressed with `compression` (none, gzip, zstd).
+    close() appends the offset index [[nodeid, attempt id, offset], ...] and a footer pointing to it.
+    Records are flushed after every attempt, the segment of a crashed worker has no index
+    and is read by scanning its records.
+
+    Usage:
+        writer = StepsWriter(run_report.report_id, compression='gzip')
+        writer.append(test_report.nodeid, step_container)
+        writer.close()
+    """
+
+    suffix = '.steps'
+
+    def __init__(self, name: str, directory: str = None, compression: str = 'none'):
+        directory = directory or b_logs_tmp_steps_path()
+        self.path = f'{directory}/{name}{self.suffix}'
+        self.compression = writer_codec(compression)
+        self._compress = codec(self.compression)[0]
+        self.index: list[list] = []
+
+        self._file = open(self.path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, CODECS.index(self.compression)))
+        self._offset = HEADER.size
+
+    def append(self, nodeid: str, container: StepContainer) -> int:
+        """Returns offset of the record in the segment"""
+        key = serializer().dumps([nodeid, container.container_id])
+        payload = self._compress(container.to_json_bytes())
+
+        offset = self._offset
+        self._file.write(RECORD.pack(len(key), len(payload)) + key + payload)
+        self._file.flush()
+        self._offset += RECORD.size + len(key) + len(payload)
+
+        self.index.append([nodeid, container.container_id, offset])
+        return offset
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write(serializer().dumps(self.index) + FOOTER.pack(self._offset, INDEX_MAGIC))
+        self._file.close()
+
+
+class StepsSegment:
+    """
+    Reader of one packed steps file
+
+    Usage:
+        with StepsSegment(path) as segment:
+            for nodeid, attempt_id, offset in segment.index():
+                container = segment.read(offset)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+
+        magic, codec_id = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f'{path} is not a b_logger steps file')
+        self._decompress = codec(CODECS[codec_id])[1]
+
+    def index(self) -> list[list]:
+        """[[nodeid, attempt id, offset], ...] from the footer, or by scanning records when there is none"""
+        size = self._file.seek(0, 2)
+        if size >= HEADER.size + FOOTER.size:
+            self._file.seek(size - FOOTER.size)
+            index_offset, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+            if magic == INDEX_MAGIC:
+                self._file.seek(index_offset)
+                return serializer().loads(self._file.read(size - FOOTER.size - index_offset))
+
+        return list(self._scan(size))
+
+    def _scan(self, size: int) -> Iterator[list]:
+        offset = HEADER.size
+        while offset + RECORD.size <= size:
+            self._file.seek(offset)
+            key_length, payload_length = RECORD.unpack(self._file.read(RECORD.size))
+            end = offset + RECORD.size + key_length + payload_length
+            if end > size:
+                break
+
+            nodeid, attempt_id = serializer().loads(self._file.read(key_length))
+            yield [nodeid, attempt_id, offset]
+            offset = end
+
+        if offset < size:
+            print(f'[BLogger][WARN] Skipping truncated steps record {self.path}:{offset}')
+
+    def read(self, offset: int) -> dict:
+        self._file.seek(offset)
+        key_length, payload_length = RECORD.unpack(self._file.read(RECORD.size))
+        self._file.seek(key_length, 1)
+        return serializer().loads(self._decompress(self._file.read(payload_length)))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StepsReader:
+    """
+    Step containers of all workers by attempt id, read through the segment indexes
+
+    Containers are loaded a test at a time: get() of an attempt reads all attempts of its test
+    and drops the previous test, so rendering tests in order reads every test once
+    and only one test's steps are in memory.
+
+    Usage:
+        with StepsReader() as steps:
+            container = steps.get(attempt_id)
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or b_logs_tmp_steps_path()
+        # attempt id -> (segment, offset)
+        self.attempts: dict[str, tuple[StepsSegment, int]] = {}
+        # nodeid -> attempt ids, in order of the attempts
+        self.tests: dict[str, list[str]] = {}
+        self._owners: dict[str, str] = {}
+        self._segments: list[StepsSegment] = []
+        self._current: dict[str, StepContainer | None] = {}
+
+        for path in sorted(glob(f'{self.directory}/*{StepsWriter.suffix}')):
+            self._read_segment(path)
+
+    def _read_segment(self, path: str):
+        segment = None
+        try:
+            segment = StepsSegment(path)
+            index = segment.index()
+        except (OSError, ValueError, ImportError, struct.error) as e:
+            print(f'[BLogger][WARN] Unable to read steps file {path}: {e}')
+            if segment is not None:
+                segment.close()
+            return
+
+        self._segments.append(segment)
+        for nodeid, attempt_id, offset in index:
+            self.attempts[attempt_id] = (segment, offset)
+            self.tests.setdefault(nodeid, []).append(attempt_id)
+            self._owners[attempt_id] = nodeid
+
+    def load(self, attempt_id: str) -> dict | None:
+        """Container of an attempt as parsed json, None when the attempt has no steps"""
+        location = self.attempts.get(attempt_id)
+        if location is None:
+            return None
+
+        segment, offset = location
+        try:
+            return segment.read(offset)
+        except Exception as e:
+            print(f'[BLogger][WARN] Unable to read steps of {attempt_id} from {segment.path}: {e}')
+            return None
+
+    def get(self, attempt_id: str, default=None) -> StepContainer | None:
+        if attempt_id not in self._current:
+            nodeid = self._owners.get(attempt_id)
+            if nodeid is None:
+                return default
+
+            self._current = {}
+            for test_attempt_id in self.tests[nodeid]:
+                data = self.load(test_attempt_id)
+                self._current[test_attempt_id] = StepContainer.from_dict(data) if data is not None else None
+
+        container = self._current.get(attempt_id)
+        return default if container is None else container
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+        self._segments.clear()
+        self._current = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
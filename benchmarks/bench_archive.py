@@ -0,0 +1,114 @@
+"""
+Run archive: segment size, write time and trend queries over many archived runs
+
+Compares with scanning the same runs stored as blog_report.json-like files.
+
+    python benchmarks/bench_archive.py
+    python benchmarks/bench_archive.py --runs 1000 --tests 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from b_logger.archive import RunArchive
+
+STATUSES = ['PASSED'] * 17 + ['FAILED', 'BROKEN', 'SKIPPED']
+
+
+class SyntheticRun:
+    """Has what RunArchive.write_run reads from a combined RunReport"""
+
+    def __init__(self, index: int, tests: int, rnd: random.Random):
+        self.report_id = f'report_{index}'
+        self.proj_name = 'bench'
+        self.env = 'stage'
+        self.start_time = f'2025-01-01 00:00:{index % 60:02d} UTC'
+        self.end_time = None
+        self.duration = None
+        self.tests = []
+        for i in range(tests):
+            status = rnd.choice(STATUSES)
+            self.tests.append({
+                'module': f'tests/test_module_{i % 40}.py',
+                'name': f'test_case_{i}[param-{i % 5}]',
+                'originalname': f'test_case_{i}',
+                'status': status,
+                'worker': f'gw{i % 8}',
+                'duration': round(rnd.expovariate(1 / 2), 3),
+                'execution_count': 2 if status == 'PASSED' and rnd.random() < 0.01 else 1,
+                'error': f'AssertionError: assert {rnd.randint(0, 99)} == 1' if status == 'FAILED' else None
+            })
+
+    def iter_test_reports(self):
+        yield from self.tests
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def scan_json(directory: str) -> int:
+    """The same flakiness pass over json reports, to compare with"""
+    last = {}
+    flips = 0
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            for test in json.load(f):
+                key = f"{test['module']}::{test['name']}"
+                passed = test['status'] == 'PASSED'
+                if key in last and last[key] != passed:
+                    flips += 1
+                last[key] = passed
+    return flips
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--runs', type=int, default=500)
+    arg_parser.add_argument('--tests', type=int, default=2_000)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    rnd = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = RunArchive(os.path.join(tmp, 'archive'))
+        json_dir = os.path.join(tmp, 'json')
+        os.makedirs(json_dir)
+
+        write_time = 0.0
+        for index in range(args.runs):
+            run = SyntheticRun(index, args.tests, rnd)
+            elapsed, _ = timed(lambda: archive.write_run(run))
+            write_time += elapsed
+            with open(os.path.join(json_dir, f'{index:06d}.json'), 'w') as f:
+                json.dump(run.tests, f, indent=4)
+
+        archive_size = sum(p.stat().st_size for p in archive.segments())
+        json_size = sum(os.path.getsize(os.path.join(json_dir, n)) for n in os.listdir(json_dir))
+
+        print(f'{args.runs} runs x {args.tests} tests')
+        print(f'archive size        {archive_size / 1024 / 1024:>8.1f} MB   json size {json_size / 1024 / 1024:>8.1f} MB')
+        print(f'write per run       {write_time / args.runs * 1000:>8.1f} ms\n')
+
+        for title, query in (('flakiness', lambda: archive.flakiness()),
+                             ('durations p50..p99', lambda: archive.durations()),
+                             ('error signatures', lambda: archive.errors()),
+                             ('runs', lambda: archive.runs()),
+                             ('json scan (flakiness)', lambda: scan_json(json_dir))):
+            elapsed, _ = timed(query)
+            print(f'{title:<24} {elapsed:>8.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory held by report entities: TestReports kept in RunReport and step trees with prints
+
+Run from the project root (needs blog.config.yaml):
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --tests 20000 --prints 50000
+
+Run it on two revisions to compare them.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from b_logger.entities.prints import Print
+from b_logger.entities.reports import RunReport
+from b_logger.entities.statuses import TestStatus
+from b_logger.entities.steps import Step, StepContainer, StepStatus
+from b_logger.entities.tests import TestReport
+
+
+def build_tests(count: int) -> RunReport:
+    report = RunReport()
+    for i in range(count):
+        test = TestReport(module=f'tests/test_module_{i % 50}.py', name=f'test_{i}', originalname=f'test_{i}')
+        test.set_status(TestStatus.PASSED)
+        test.set_duration(0.5)
+        test.add_steps(f'steps_{i}')
+        report.add_test_report(test)
+    return report
+
+
+def build_spilled_tests(count: int) -> RunReport:
+    report = RunReport()
+    for i in range(count):
+        test = TestReport(module=f'tests/test_module_{i % 50}.py', name=f'test_{i}', originalname=f'test_{i}')
+        test.set_status(TestStatus.PASSED)
+        test.set_duration(0.5)
+        test.add_steps(f'steps_{i}')
+        report.add_test_index(test, offset=i * 512)
+    return report
+
+
+def build_steps(prints: int, steps: int) -> StepContainer:
+    container = StepContainer()
+    container.current_stage = 'call'
+    for i in range(steps):
+        step = Step(f'step {i}', StepStatus.PASSED)
+        container.add_step(step)
+        for j in range(prints // steps):
+            line = Print(f'print {j}')
+            line.set_parent_id(step.id)
+            step.add_sub_step(line)
+    return container
+
+
+def measure(build, *args) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--tests', type=int, default=10_000)
+    arg_parser.add_argument('--prints', type=int, default=50_000)
+    arg_parser.add_argument('--steps', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    tests_mem, _ = measure(build_tests, args.tests)
+    spilled_mem, _ = measure(build_spilled_tests, args.tests) if hasattr(RunReport, 'add_test_index') else (0, None)
+    steps_mem, _ = measure(build_steps, args.prints, args.steps)
+
+    print(f'{"case":<40} {"total MB":>10} {"bytes/object":>14}')
+    print(f'{f"{args.tests} TestReports in RunReport":<40} {tests_mem / 1024 / 1024:>10.2f} {tests_mem / args.tests:>14.0f}')
+    print(f'{f"{args.tests} TestReports, spill_reports":<40} {spilled_mem / 1024 / 1024:>10.2f} {spilled_mem / args.tests:>14.0f}')
+    objects = args.steps + args.prints
+    print(f'{f"{args.steps} steps with {args.prints} prints":<40} {steps_mem / 1024 / 1024:>10.2f} {steps_mem / objects:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-test persistence latency of step containers and the files they leave behind
+
+Every test attempt saves its step container. Each protocol saves `--tests` synthetic containers of `--steps` steps:
+    - filelock:    json file per attempt, FileLock(<path>.lock) around a plain write (needs filelock installed)
+    - atomic:      json file per attempt, written to a temp file next to the target, then os.replace
+    - packed:      record appended to one segment file per worker (StepsWriter, what RunTime does)
+    - packed-gzip / packed-zstd: packed with steps_compression (zstd needs Python 3.14+ or zstandard)
+
+Lock files and small files hurt most on network filesystems (NFS/SMB), where every create is a round trip.
+Point `--dir` at such a mount to compare:
+    python benchmarks/bench_persistence.py
+    python benchmarks/bench_persistence.py --dir /mnt/nfs/tmp --tests 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from b_logger.entities.steps import Step, StepContainer
+from b_logger.utils.file_ops import atomic_write
+from b_logger.utils.steps_store import StepsWriter, codec
+
+
+def make_container(steps: int) -> StepContainer:
+    container = StepContainer()
+    for i in range(steps):
+        step = Step(title=f'Step {i}: open the page and check the header', expected='x' * 200)
+        step.info = {'url': f'https://example.com/page/{i}', 'user': 'test_user'}
+        container.add_step(step)
+    return container
+
+
+def save_filelock(directory: str, containers: list[StepContainer]) -> list[float]:
+    from filelock import FileLock
+
+    timings = []
+    for container in containers:
+        started = time.perf_counter()
+        path = f'{directory}/{container.container_id}'
+        with FileLock(f'{path}.lock'):
+            with open(f'{path}.json', 'wb') as f:
+                f.write(container.to_json_bytes())
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def save_atomic(directory: str, containers: list[StepContainer]) -> list[float]:
+    timings = []
+    for container in containers:
+        started = time.perf_counter()
+        atomic_write(f'{directory}/{container.container_id}.json', container.to_json_bytes())
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def save_packed(compression: str):
+    def save(directory: str, containers: list[StepContainer]) -> list[float]:
+        writer = StepsWriter('report', directory, compression)
+        timings = []
+        for i, container in enumerate(containers):
+            started = time.perf_counter()
+            writer.append(f'tests/test_module.py::test_{i}', container)
+            timings.append(time.perf_counter() - started)
+        writer.close()
+        return timings
+    return save
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--dir', default=None, help='directory to write to, a temp dir by default')
+    arg_parser.add_argument('--tests', type=int, default=500)
+    arg_parser.add_argument('--steps', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    cases = [('atomic', save_atomic), ('packed', save_packed('none')), ('packed-gzip', save_packed('gzip'))]
+    try:
+        import filelock  # noqa: F401
+        cases.insert(0, ('filelock', save_filelock))
+    except ImportError:
+        print('filelock is not installed, the filelock protocol is skipped\n')
+    try:
+        codec('zstd')
+        cases.append(('packed-zstd', save_packed('zstd')))
+    except ImportError:
+        print('no zstd module (Python 3.14+ or zstandard), packed-zstd is skipped\n')
+
+    containers = [make_container(args.steps) for _ in range(args.tests)]
+    size = len(containers[0].to_json_bytes())
+    print(f'{args.tests} saves of a {args.steps} step container ({size / 1024:.1f} KB)\n')
+    print(f'{"protocol":<12} {"avg ms":>8} {"p50 ms":>8} {"p95 ms":>8} {"max ms":>8} {"files":>7} {"KB on disk":>11}')
+
+    for name, save in cases:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            timings = sorted(t * 1000 for t in save(tmp, containers))
+            files = os.listdir(tmp)
+            disk = sum(os.path.getsize(os.path.join(tmp, f)) for f in files)
+        print(f'{name:<12} {statistics.fmean(timings):>8.3f} {timings[len(timings) // 2]:>8.3f} '
+              f'{timings[int(len(timings) * 0.95)]:>8.3f} {timings[-1]:>8.3f} {len(files):>7} {disk / 1024:>11.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Render time and peak RSS of blog_report.html on a synthetic report
+
+Builds a report with steps in a temporary b_logs dir and renders it in fresh processes:
+    - render:   template.render() into one string, then written at once
+    - resident: step containers of all tests are loaded before rendering, then streamed
+    - stream:   template.generate() written chunk by chunk, steps are read a test at a time (what HTMLGenerator does)
+
+Run from the project root (needs blog.config.yaml):
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --tests 20000 --steps 5 --runs 3
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(LIBRARY_ROOT))
+
+from b_logger.entities.prints import Print
+from b_logger.entities.reports import RunReport
+from b_logger.entities.statuses import TestStatus
+from b_logger.entities.steps import Step, StepContainer, StepStatus
+from b_logger.entities.tests import TestReport
+from b_logger.utils.paths import set_b_logs_dir, b_logs_path, init_dirs
+from b_logger.utils.steps_store import StepsWriter
+
+STATUSES = [TestStatus.PASSED, TestStatus.PASSED, TestStatus.PASSED, TestStatus.FAILED, TestStatus.SKIPPED]
+
+RENDER_SNIPPET = '''
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from b_logger.utils.paths import set_b_logs_dir, b_logs_path
+set_b_logs_dir({b_logs!r})
+from b_logger.entities.reports import RunReport
+from b_logger.generators.html_gen import HTMLGenerator, stream_template
+from b_logger.utils.steps_store import StepsReader
+
+generator = HTMLGenerator()
+report = RunReport.from_json(generator.report_path)
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+started = time.perf_counter()
+path = f'{{b_logs_path()}}/blog_report.html'
+steps = StepsReader()
+if {variant!r} == 'resident':
+    steps = {{attempt_id: steps.get(attempt_id) for attempt_id in steps.attempts}}
+if {variant!r} == 'render':
+    html = generator.template.render(report=report, steps=steps)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+else:
+    stream_template(generator.template, path, report=report, steps=steps)
+elapsed = time.perf_counter() - started
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, before, peak)
+'''
+
+
+def make_report(tests: int, steps: int):
+    init_dirs()
+    report = RunReport()
+    writer = StepsWriter(report.report_id)
+    for i in range(tests):
+        test = TestReport(module=f'tests/test_module_{i % 50}.py',
+                          name=f'test_case_{i}[param-{i % 7}]',
+                          originalname=f'test_case_{i}')
+        test.set_status(STATUSES[i % len(STATUSES)])
+        test.set_duration(round(i % 1000 / 7, 2))
+        test.set_description(f'Synthetic test number {i}')
+        test.add_info({'env': 'stage', 'build': i})
+
+        container = StepContainer()
+        container.current_stage = 'call'
+        for j in range(steps):
+            step = Step(f'step {j} of test {i}', StepStatus.PASSED)
+            line = Print(f'print in step {j}')
+            line.set_parent_id(step.id)
+            step.add_sub_step(line)
+            container.add_step(step)
+        writer.append(f'{test.module}::{test.name}', container)
+        test.add_steps(container.container_id)
+
+        if test.status == TestStatus.FAILED:
+            test.set_error('AssertionError: assert 1 == 2')
+            test.set_stacktrace('Traceback (most recent call last):\n' * 10)
+        report.add_test_report(test)
+
+    writer.close()
+    report.set_end_time()
+    report.count_duration()
+    report.to_json_file(f'{b_logs_path()}/blog_report', pretty=True)
+
+
+def render(variant: str, b_logs: str) -> tuple[float, float, float]:
+    snippet = RENDER_SNIPPET.format(root=str(LIBRARY_ROOT), b_logs=b_logs, variant=variant)
+    result = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f'{variant} failed:\n{result.stderr}')
+    elapsed, before, peak = map(float, result.stdout.strip().splitlines()[-1].split())
+    # ru_maxrss is in KB on Linux
+    return elapsed, before / 1024, peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--tests', type=int, default=10_000)
+    arg_parser.add_argument('--steps', type=int, default=3, help='steps per test, each with one print')
+    arg_parser.add_argument('--runs', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        b_logs = os.path.join(tmp, 'b_logs')
+        set_b_logs_dir(b_logs)
+
+        started = time.perf_counter()
+        make_report(args.tests, args.steps)
+        print(f'report with {args.tests} tests created in {time.perf_counter() - started:.1f}s\n')
+
+        print(f'{"variant":<8} {"render s":>9} {"RSS before MB":>14} {"peak RSS MB":>12} {"added MB":>9} {"html MB":>8}')
+        for variant in ('render', 'resident', 'stream'):
+            results = [render(variant, b_logs) for _ in range(args.runs)]
+            elapsed = statistics.median(r[0] for r in results)
+            before = statistics.median(r[1] for r in results)
+            peak = statistics.median(r[2] for r in results)
+            html_size = os.path.getsize(f'{b_logs}/blog_report.html') / 1024 / 1024
+            print(f'{variant:<8} {elapsed:>9.2f} {before:>14.1f} {peak:>12.1f} {peak - before:>9.1f} {html_size:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
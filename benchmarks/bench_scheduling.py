@@ -0,0 +1,53 @@
+"""
+Makespan of `--dist load` against duration scheduling (longest first) on synthetic suites
+
+Durations are drawn from a heavy-tailed distribution: mostly fast tests and a tail of slow UI tests,
+slow tests are grouped at the end of the collection, as they usually are in a `tests/ui` folder.
+Duration scheduling uses noisy history (estimate = real duration +- `--noise`).
+
+    python benchmarks/bench_scheduling.py
+    python benchmarks/bench_scheduling.py --tests 5000 --workers 8 16 32 --noise 0.5
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from b_logger.utils.durations import lpt_order, simulate_load_scheduling, simulate_prefetch
+
+
+def make_suite(tests: int, slow_share: float, rnd: random.Random) -> list[float]:
+    fast = [rnd.expovariate(1 / 0.5) for _ in range(int(tests * (1 - slow_share)))]
+    slow = [rnd.uniform(30, 180) for _ in range(tests - len(fast))]
+    return fast + slow
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--tests', type=int, default=2_000)
+    arg_parser.add_argument('--workers', type=int, nargs='+', default=[4, 8, 16, 32])
+    arg_parser.add_argument('--slow-share', type=float, default=0.05, help='share of slow UI tests')
+    arg_parser.add_argument('--noise', type=float, default=0.3, help='relative error of history estimates')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    durations = make_suite(args.tests, args.slow_share, rnd)
+    estimates = [d * rnd.uniform(1 - args.noise, 1 + args.noise) for d in durations]
+    total = sum(durations)
+
+    print(f'{args.tests} tests, {total / 60:.1f} min of work, history noise +-{args.noise:.0%}\n')
+    print(f'{"workers":>7} {"lower bound s":>14} {"--dist load s":>14} {"duration s":>11} {"gain":>7}')
+
+    for workers in args.workers:
+        lower_bound = max(total / workers, max(durations))
+        load = simulate_load_scheduling(durations, workers)
+        duration = simulate_prefetch(durations, lpt_order(estimates), workers)
+        print(f'{workers:>7} {lower_bound:>14.0f} {load:>14.0f} {duration:>11.0f} {(load - duration) / load:>7.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Screenshot pipeline: time spent on the test thread and size on disk per format
+
+A synthetic page-like screenshot (text lines, blocks, a photo-like area) is attached `--count` times:
+    - sync:  attachment_writer disabled, encoding and write happen on the test thread
+    - async: async_attachments, the test thread only hands the PNG over
+
+Needs Pillow. Run from the project root (needs blog.config.yaml):
+    python benchmarks/bench_screenshots.py
+    python benchmarks/bench_screenshots.py --count 50 --width 2560 --height 1440
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image, ImageDraw
+
+from b_logger.config import blog_config
+from b_logger.utils import screenshots
+from b_logger.utils.attachment_writer import attachment_writer
+from b_logger.utils.paths import set_b_logs_dir, attachments_path
+
+CASES = [
+    ('png', 80, 0),
+    ('png', 80, 1280),
+    ('webp', 80, 0),
+    ('webp', 80, 1280),
+    ('jpeg', 80, 0),
+    ('jpeg', 80, 1280),
+]
+
+
+def make_screenshot(width: int, height: int) -> bytes:
+    rnd = random.Random(1)
+    image = Image.new('RGB', (width, height), (248, 250, 252))
+    draw = ImageDraw.Draw(image)
+
+    for y in range(20, height // 2, 24):
+        draw.text((40, y), 'Lorem ipsum dolor sit amet ' * rnd.randint(1, 6), fill=(15, 23, 42))
+    for _ in range(30):
+        x, y = rnd.randrange(width - 200), rnd.randrange(height - 100)
+        draw.rectangle((x, y, x + rnd.randint(50, 200), y + rnd.randint(20, 100)),
+                       fill=(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+
+    photo = Image.effect_noise((width // 3, height // 3), 60).convert('RGB')
+    image.paste(photo, (width // 2, height // 2))
+
+    out = io.BytesIO()
+    image.save(out, format='PNG')
+    return out.getvalue()
+
+
+def run_case(png: bytes, count: int, fmt: str, quality: int, max_size: int, background: bool) -> tuple[float, float, int]:
+    blog_config.screenshot_format = fmt
+    blog_config.screenshot_quality = quality
+    blog_config.screenshot_max_size = max_size
+    screenshots.encoder.cache_clear()
+
+    if background:
+        attachment_writer.configure(workers=2, queue_size=count)
+    else:
+        attachment_writer.enabled = False
+
+    started = time.perf_counter()
+    for i in range(count):
+        screenshots.screenshot_attachment(png, f'scr_{fmt}_{max_size}_{background}_{i}.png')
+    test_thread = time.perf_counter() - started
+
+    attachment_writer.drain()
+    total = time.perf_counter() - started
+
+    ext = screenshots.FORMATS[fmt][0]
+    size = sum(f.stat().st_size for f in Path(attachments_path()).glob(f'scr_{fmt}_{max_size}_{background}_*{ext}'))
+    return test_thread, total, size
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--count', type=int, default=20)
+    arg_parser.add_argument('--width', type=int, default=1920)
+    arg_parser.add_argument('--height', type=int, default=1080)
+    args = arg_parser.parse_args()
+
+    png = make_screenshot(args.width, args.height)
+    print(f'screenshot {args.width}x{args.height}, png {len(png) / 1024:.0f} KB, {args.count} attachments per case\n')
+    print(f'{"format":<7} {"max":>5} {"mode":>6} {"test thread ms":>15} {"total ms":>9} {"KB/scr":>8}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        set_b_logs_dir(os.path.join(tmp, 'b_logs'))
+        os.makedirs(attachments_path())
+
+        for fmt, quality, max_size in CASES:
+            for background in (False, True):
+                test_thread, total, size = run_case(png, args.count, fmt, quality, max_size, background)
+                print(f'{fmt:<7} {max_size or "-":>5} {"async" if background else "sync":>6} '
+                      f'{test_thread / args.count * 1000:>15.2f} {total / args.count * 1000:>9.2f} '
+                      f'{size / args.count / 1024:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
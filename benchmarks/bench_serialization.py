@@ -0,0 +1,87 @@
+"""
+Serialization throughput of json backends on synthetic RunReports
+
+Run from the project root (needs blog.config.yaml):
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --tests 1000 10000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from b_logger.entities.reports import RunReport
+from b_logger.entities.statuses import TestStatus
+from b_logger.entities.tests import TestReport
+from b_logger.utils.basedatamodel import BaseDataModel
+from b_logger.utils.serializers import BACKENDS, get_serializer
+
+STATUSES = [TestStatus.PASSED, TestStatus.PASSED, TestStatus.PASSED, TestStatus.FAILED, TestStatus.SKIPPED]
+
+
+def build_report(tests: int) -> RunReport:
+    report = RunReport()
+    for i in range(tests):
+        test = TestReport(module=f'tests/test_module_{i % 50}.py',
+                          name=f'test_case_{i}[param-{i % 7}]',
+                          originalname=f'test_case_{i}')
+        test.set_status(STATUSES[i % len(STATUSES)])
+        test.set_duration(round(i % 1000 / 7, 2))
+        test.set_description(f'Synthetic test number {i}')
+        test.add_info({'env': 'stage', 'build': i, 'params': {'a': i, 'b': [1, 2, 3]}})
+        test.steps = [f'steps_{i:08d}-0000-0000-0000-000000000000']
+        if test.status == TestStatus.FAILED:
+            test.set_error('AssertionError: assert 1 == 2')
+            test.set_stacktrace('Traceback (most recent call last):\n' * 10)
+        report.add_test_report(test)
+    report.set_end_time()
+    report.count_duration()
+    return report
+
+
+def measure(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--tests', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    backends = []
+    for name in BACKENDS:
+        serializer = get_serializer(name)
+        if serializer.name == name:
+            backends.append(serializer)
+        else:
+            print(f'{name}: not installed, skipped')
+
+    print(f'{"tests":>8} {"backend":>8} {"mode":>7} {"size MB":>8} {"dumps s":>8} {"MB/s":>8} {"loads s":>8} {"tests/s":>10}')
+
+    for tests in args.tests:
+        report = build_report(tests)
+
+        for serializer in backends:
+            for pretty in (False, True):
+                dump = lambda: serializer.dumps(report, default=BaseDataModel.custom_serializer, pretty=pretty)
+                data = dump()
+                size = len(data) / 1024 / 1024
+
+                dumps_time = measure(dump, args.repeat)
+                loads_time = measure(lambda: serializer.loads(data), args.repeat)
+
+                print(f'{tests:>8} {serializer.name:>8} {"pretty" if pretty else "compact":>7} {size:>8.2f} '
+                      f'{dumps_time:>8.3f} {size / dumps_time:>8.1f} {loads_time:>8.3f} {tests / dumps_time:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
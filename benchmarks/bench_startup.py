@@ -0,0 +1,81 @@
+"""
+Startup cost of the plugin in a big project tree
+
+Creates a temporary project (blog.config.yaml + a synthetic node_modules tree) and measures:
+    - `import b_logger.plugin` in a fresh interpreter (what every pytest start and xdist worker pays)
+    - b_logs path resolution against the legacy recursive PathFinder.find scan
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --files 100000 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIBRARY_ROOT = Path(__file__).resolve().parents[1]
+
+IMPORT_SNIPPET = '''
+import time
+started = time.perf_counter()
+import b_logger.plugin
+from b_logger.utils.paths import b_logs_path, attachments_path, b_logs_tmp_steps_path
+b_logs_path(), attachments_path(), b_logs_tmp_steps_path()
+print(time.perf_counter() - started)
+'''
+
+SCAN_SNIPPET = '''
+import time
+from b_logger.utils.paths import pathfinder
+started = time.perf_counter()
+pathfinder.find('b_logs')
+print(time.perf_counter() - started)
+'''
+
+
+def make_project(root: Path, files: int):
+    (root / 'blog.config.yaml').write_text('project_name: bench\n', encoding='utf-8')
+    per_dir = 100
+    for i in range(files):
+        directory = root / 'node_modules' / f'pkg_{i // per_dir}'
+        if i % per_dir == 0:
+            directory.mkdir(parents=True)
+        (directory / f'file_{i}.js').touch()
+
+
+def run(snippet: str, cwd: Path, runs: int) -> list[float]:
+    env = dict(os.environ, PYTHONPATH=str(LIBRARY_ROOT))
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', snippet], cwd=cwd, env=env,
+                                capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--files', type=int, default=20_000, help='files in the synthetic node_modules tree')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        started = time.perf_counter()
+        make_project(project, args.files)
+        print(f'project with {args.files} files created in {time.perf_counter() - started:.1f}s\n')
+
+        for title, snippet in (('import b_logger.plugin + paths', IMPORT_SNIPPET),
+                               ('legacy PathFinder.find scan', SCAN_SNIPPET)):
+            timings = run(snippet, project, args.runs)
+            print(f'{title:<32} median {statistics.median(timings) * 1000:>9.1f} ms   '
+                  f'min {min(timings) * 1000:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from b_logger.archive import RunArchive, error_signature
+
+
+def _run(*tests: tuple) -> SimpleNamespace:
+    """tests: (name, status, duration[, execution_count[, error]])"""
+    reports = []
+    for name, status, duration, *rest in tests:
+        execution_count = rest[0] if rest else 1
+        error = rest[1] if len(rest) > 1 else None
+        reports.append({'module': 'tests/test_module.py', 'name': name, 'originalname': name, 'status': status,
+                        'duration': duration, 'execution_count': execution_count, 'error': error, 'worker': 'gw0'})
+    return SimpleNamespace(report_id='report', proj_name='project', env='prod', start_time=None, end_time=None,
+                           duration=None, iter_test_reports=lambda: iter(reports))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RunArchive(tmp_path / 'archive')
+    archive.write_run(_run(('test_stable', 'PASSED', 1.0), ('test_flaky', 'PASSED', 2.0),
+                           ('test_skipped', 'SKIPPED', None)))
+    archive.write_run(_run(('test_stable', 'PASSED', 2.0), ('test_flaky', 'FAILED', 4.0, 1, 'Timeout after 30.5s')))
+    archive.write_run(_run(('test_stable', 'PASSED', 3.0), ('test_flaky', 'PASSED', 6.0, 2)))
+    archive.write_run(_run(('test_stable', 'PASSED', 4.0), ('test_flaky', 'BROKEN', 8.0, 1, 'Timeout after 12s')))
+    return archive
+
+
+def test_runs(archive):
+    runs = archive.runs()
+
+    assert [run['tests'] for run in runs] == [3, 2, 2, 2]
+    assert runs[1]['results'] == {'PASSED': 1, 'FAILED': 1}
+    assert len(archive.runs(last=2)) == 2
+
+
+def test_flakiness(archive):
+    flaky, stable, skipped = archive.flakiness()
+
+    assert flaky == {'test': 'tests/test_module.py::test_flaky', 'runs': 4, 'failed': 2, 'retried': 1,
+                     'flips': 3, 'flip_rate': 1.0, 'fail_rate': 0.5}
+    assert (stable['test'], stable['flips'], stable['fail_rate']) == ('tests/test_module.py::test_stable', 0, 0.0)
+    assert (skipped['runs'], skipped['flips']) == (1, 0)
+
+    assert archive.flakiness(last=2)[0]['flips'] == 1
+
+
+def test_durations(archive):
+    durations = {row['test'].split('::')[1]: row for row in archive.durations(percentiles=(50, 100))}
+
+    assert list(durations) == ['test_flaky', 'test_stable']
+    assert (durations['test_flaky']['p50'], durations['test_flaky']['p100']) == (5.0, 8.0)
+    assert (durations['test_stable']['runs'], durations['test_stable']['mean']) == (4, 2.5)
+
+
+def test_errors(archive):
+    assert archive.errors() == [{'signature': 'Timeout after <n>s', 'count': 2, 'tests': 1}]
+    assert error_signature('Id 0x7f3a and 1d2b3c4d-1111-2222-3333-444455556666\ntraceback') == 'Id <addr> and <uuid>'
+
+
+def test_broken_segment_is_skipped(archive, capsys):
+    (archive.path / '99999999T999999_broken.blogarc').write_bytes(b'garbage')
+
+    assert len(archive.runs()) == 4
+    assert 'Skipping archive segment' in capsys.readouterr().out
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from b_logger.config import blog_config
+from b_logger.entities.attachments import Attachment
+from b_logger.utils.attachment_writer import attachment_writer
+
+
+@pytest.fixture
+def attachments_dir(tmp_path, monkeypatch):
+    root = tmp_path / 'attachments'
+    monkeypatch.setattr(Attachment, '_root', staticmethod(lambda: root))
+    monkeypatch.setattr(Attachment, '_stored_blobs', set())
+    monkeypatch.setattr(blog_config, 'attachments_dedup', True)
+    return root
+
+
+def test_blob_is_not_linked_to_source(tmp_path, attachments_dir, monkeypatch):
+    monkeypatch.setattr(blog_config, 'attachments_strategy', 'hardlink')
+    source = tmp_path / 'report.txt'
+    source.write_bytes(b'original')
+
+    attachment = Attachment(source)
+    attachment_writer.drain()
+    blob = attachments_dir / Attachment.resolve_path(attachment).removeprefix('attachments/')
+
+    assert attachment.strategy != 'hardlink'
+    assert source.stat().st_nlink == 1
+
+    source.write_bytes(b'edited')
+    assert blob.read_bytes() == b'original'
+
+
+def test_unique_path_is_hardlinked(tmp_path, attachments_dir, monkeypatch):
+    monkeypatch.setattr(blog_config, 'attachments_dedup', False)
+    monkeypatch.setattr(blog_config, 'attachments_strategy', 'hardlink')
+    source = tmp_path / 'report.txt'
+    source.write_bytes(b'original')
+
+    attachment = Attachment(source)
+
+    assert attachment.strategy == 'hardlink'
+    assert Path(attachments_dir / attachment.name).samefile(source)
+
+
+def test_blob_is_written_again_in_next_session(attachments_dir):
+    first = Attachment(b'screenshot', 'page.png')
+    attachment_writer.drain()
+    blob = attachments_dir / Attachment.resolve_path(first).removeprefix('attachments/')
+    blob.unlink()
+
+    Attachment.forget_blobs()
+    Attachment(b'screenshot', 'page.png')
+    attachment_writer.drain()
+
+    assert blob.read_bytes() == b'screenshot'
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from b_logger.utils.attachment_writer import AttachmentWriter
+
+
+def test_disabled_writer_writes_in_place():
+    writer = AttachmentWriter()
+    written = []
+
+    writer.submit(written.append, 'data')
+
+    assert written == ['data']
+    assert writer.stats()['submitted'] == 0
+
+
+def test_drain_waits_for_queued_writes():
+    writer = AttachmentWriter()
+    writer.configure(workers=2, queue_size=4)
+    written = []
+
+    def write(i):
+        time.sleep(0.001)
+        written.append(i)
+
+    for i in range(50):
+        writer.submit(write, i, size=10)
+    writer.drain()
+
+    assert sorted(written) == list(range(50))
+    stats = writer.stats()
+    assert (stats['written'], stats['bytes'], stats['queue_depth']) == (50, 500, 0)
+    assert stats['max_queue_depth'] <= 4
+
+
+def test_full_queue_blocks_submit():
+    writer = AttachmentWriter()
+    writer.configure(workers=1, queue_size=2)
+    release = threading.Event()
+
+    writer.submit(release.wait)
+    writer.submit(release.wait)
+    blocked = threading.Thread(target=writer.submit, args=(release.wait,))
+    blocked.start()
+
+    blocked.join(0.2)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(5)
+    writer.drain()
+
+    assert not blocked.is_alive()
+    assert writer.stats()['written'] == 3
+
+
+def test_failed_write_frees_its_slot(capsys):
+    writer = AttachmentWriter()
+    writer.configure(workers=1, queue_size=1)
+
+    def fail():
+        raise OSError('disk full')
+
+    writer.submit(fail)
+    writer.submit(fail)
+    writer.drain()
+
+    assert writer.stats()['failed'] == 2
+    assert 'disk full' in capsys.readouterr().out
+
+
+def test_submit_during_drain_is_not_lost():
+    writer = AttachmentWriter()
+    writer.configure(workers=2, queue_size=8)
+    written = []
+    done = threading.Event()
+
+    def submit_all():
+        for i in range(2000):
+            writer.submit(written.append, i)
+        done.set()
+
+    submitter = threading.Thread(target=submit_all)
+    submitter.start()
+    while not done.is_set():
+        writer.drain()
+    submitter.join()
+    writer.drain()
+
+    assert len(written) == 2000
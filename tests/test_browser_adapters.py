@@ -0,0 +1,62 @@
+import pytest
+
+from b_logger.utils import browser_adapters
+from b_logger.utils.browser_adapters import BrowserAdapter, adapter_class, register_adapter
+
+
+class Driver:
+    pass
+
+
+class ChromeDriver(Driver):
+    pass
+
+
+class DriverAdapter(BrowserAdapter):
+    probes = 0
+
+    def make_screenshot(self):
+        return b''
+
+    @classmethod
+    def is_valid(cls, obj) -> bool:
+        cls.probes += 1
+        return isinstance(obj, Driver)
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(browser_adapters, '_registry', {})
+    monkeypatch.setattr(browser_adapters, '_resolved', {})
+    monkeypatch.setattr(browser_adapters, 'ADAPTERS', list(browser_adapters.ADAPTERS))
+    monkeypatch.setattr(DriverAdapter, 'probes', 0)
+
+
+def test_registered_type_matches_subclasses():
+    register_adapter(DriverAdapter, Driver)
+
+    assert adapter_class(ChromeDriver()) is DriverAdapter
+    assert DriverAdapter.probes == 0
+
+
+def test_registered_by_qualified_name():
+    register_adapter(DriverAdapter, f'{__name__}.Driver')
+
+    assert adapter_class(ChromeDriver()) is DriverAdapter
+
+
+def test_is_valid_is_probed_once_per_type():
+    register_adapter(DriverAdapter)
+
+    for _ in range(3):
+        assert adapter_class(ChromeDriver()) is DriverAdapter
+    assert DriverAdapter.probes == 1
+
+
+def test_unsupported_type_is_cached_until_register(capsys):
+    assert adapter_class(Driver()) is None
+    assert adapter_class(Driver()) is None
+    assert capsys.readouterr().out.count('Unsupported browser object Driver') == 1
+
+    register_adapter(DriverAdapter, Driver)
+    assert adapter_class(Driver()) is DriverAdapter
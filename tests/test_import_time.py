@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# opt-in budget for b_logger.plugin cumulative import time (ms), pytest itself is imported beforehand and not counted.
+# Wall clock of a cold subprocess depends on the machine, so it is checked only when set
+IMPORT_BUDGET_MS = os.environ.get('BLOG_IMPORT_BUDGET_MS')
+
+# needed only by the controller (report generation) or by enabled integrations
+LAZY_MODULES = ('jinja2', 'dateutil', 'allure', 'qase', 'selenium')
+
+
+def _import_times() -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import pytest; import b_logger.plugin'],
+        cwd=PROJECT_ROOT,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get('PYTHONPATH')]))),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def test_plugin_import_time():
+    times = _import_times()
+
+    eager = [name for name in times if name.split('.')[0] in LAZY_MODULES]
+    assert not eager, f'Imported eagerly by b_logger.plugin: {eager}'
+
+
+def test_plugin_import_budget():
+    if not IMPORT_BUDGET_MS:
+        pytest.skip('set BLOG_IMPORT_BUDGET_MS to check the plugin import time')
+
+    plugin_ms = _import_times()['b_logger.plugin'] / 1000
+    assert plugin_ms < float(IMPORT_BUDGET_MS), f'b_logger.plugin import took {plugin_ms:.1f} ms, budget {IMPORT_BUDGET_MS} ms'
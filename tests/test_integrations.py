@@ -0,0 +1,134 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from b_logger import integrations
+from b_logger.integrations import IntegrationBase, Integrations
+
+pytest_plugins = 'pytester'
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class Recorder(IntegrationBase):
+    def __init__(self):
+        self.calls = []
+
+    def is_enabled(self):
+        return True
+
+    @contextmanager
+    def step(self, title, expected=None):
+        self.calls.append(('step', title))
+        yield
+        self.calls.append(('end step', title))
+
+    def description(self, text):
+        self.calls.append(('description', text))
+
+    def info(self, name, value):
+        self.calls.append(('info', name, value))
+
+    def link(self, url, name):
+        self.calls.append(('link', name))
+
+    def attach(self, content, name, type_=None):
+        self.calls.append(('attach', name, content))
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(integrations, '_enabled', [recorder])
+    monkeypatch.setattr(Integrations, '_buffer', [])
+    return recorder
+
+
+def test_events_are_buffered_until_flush(recorder):
+    Integrations.info('user', 'admin')
+    Integrations.print('first')
+    Integrations.print('second')
+    Integrations.attach({'a': 1}, 'data.json', 'application/json')
+    assert recorder.calls == []
+
+    Integrations.flush()
+    Integrations.flush()
+
+    assert recorder.calls == [
+        ('info', 'user', 'admin'),
+        ('attach', 'blog_prints', 'first\nsecond'),
+        ('attach', 'data.json', integrations.process_json({'a': 1})),
+    ]
+
+
+def test_consecutive_info_is_one_batch(recorder):
+    Integrations.info('user', 'admin')
+    Integrations.info_batch({'env': 'prod', 'build': 7})
+    Integrations.print('between')
+    Integrations.info('retry', 1)
+
+    with Integrations.step('step'):
+        Integrations.print('in step')
+
+    assert recorder.calls == [
+        ('info', 'user, env, build', {'user': 'admin', 'env': 'prod', 'build': 7}),
+        ('attach', 'blog_prints', 'between'),
+        ('info', 'retry', 1),
+        ('step', 'step'),
+        ('attach', 'blog_prints', 'in step'),
+        ('end step', 'step'),
+    ]
+
+
+def test_batches_reach_adapter_once_per_boundary(pytester, monkeypatch):
+    """Info of a fixture and of the test body is sent once, at its boundary, and once more as blog_info at the end"""
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get('PYTHONPATH')])))
+    (pytester.path / 'blog.config.yaml').write_text("project_name: 'Integrations'")
+    pytester.makeconftest('''
+        import json
+        from b_logger import integrations
+        from tests.test_integrations import Recorder
+
+        recorder = Recorder()
+
+
+        def pytest_configure():
+            integrations._enabled = [recorder]
+
+
+        def pytest_unconfigure():
+            with open('calls.json', 'w') as f:
+                json.dump(recorder.calls, f)
+    ''')
+    pytester.makepyfile('''
+        import pytest
+        from b_logger import blog
+
+
+        @pytest.fixture
+        def account():
+            blog.info(user='admin')
+            blog.print('account created')
+
+
+        def test_info(account):
+            blog.info(page='login')
+            blog.info(lang='en')
+    ''')
+
+    pytester.runpytest_subprocess('-p', 'b_logger.plugin', '-p', 'no:cacheprovider').assert_outcomes(passed=1)
+    calls = [tuple(call) for call in json.loads((pytester.path / 'calls.json').read_text())]
+    fixtures = calls[0][2]
+
+    assert calls[:4] == [
+        ('info', 'fixtures', fixtures),
+        ('info', 'user', 'admin'),
+        ('attach', 'blog_prints', 'account created'),
+        ('info', 'page, lang', {'page': 'login', 'lang': 'en'}),
+    ]
+    assert calls[4][:2] == ('attach', 'blog_info')
+    assert json.loads(calls[4][2]) == {'FIXTURES': fixtures, 'USER': 'admin', 'PAGE': 'login', 'LANG': 'en'}
+    assert len(calls) == 5
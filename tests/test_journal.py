@@ -0,0 +1,33 @@
+from b_logger.entities.reports import RunReport
+# aliased, pytest would try to collect Test* names
+from b_logger.entities.statuses import TestStatus as Status
+from b_logger.entities.tests import TestReport as Report
+from b_logger.utils.journal import ReportJournal
+
+
+def _test_report(name: str, status: Status) -> Report:
+    test_report = Report('tests/test_module.py', f'{name}[param]', name)
+    test_report.set_status(status)
+    return test_report
+
+
+def test_torn_last_line_is_skipped(tmp_path, capsys):
+    """A worker killed mid-write leaves a partial last record, earlier tests are still in the report"""
+    path = str(tmp_path / 'report_test.ndjson')
+    journal = ReportJournal(path, fsync_every=1)
+    journal.append(_test_report('test_first', Status.PASSED))
+    journal.append(_test_report('test_second', Status.FAILED))
+    torn = journal.append(_test_report('test_third', Status.PASSED))
+    journal.close()
+
+    with open(path, 'r+b') as f:
+        f.truncate(torn + 20)
+
+    run_report = RunReport()
+    run_report.load_journal(path)
+
+    tests = run_report.modules['tests/test_module.py']['tests']
+    assert list(tests) == ['test_first', 'test_second']
+    assert tests['test_second'][0]['status'] == Status.FAILED
+    assert (run_report.run_results.PASSED, run_report.run_results.FAILED) == (1, 1)
+    assert 'Skipping corrupted journal record' in capsys.readouterr().out
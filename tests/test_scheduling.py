@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('xdist')
+
+from b_logger.scheduling import DurationScheduling
+from b_logger.utils.durations import estimate, lpt_order, scheduling_summary
+
+
+class FakeNode:
+    def __init__(self, name: str):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent: list[int] = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def _scheduler(history: dict[str, float], collection: list[str], nodes: int = 2):
+    config = SimpleNamespace(getvalue=lambda name: [f'{nodes}*popen'], hook=None)
+    scheduler = DurationScheduling(config, history=history)
+    workers = [FakeNode(f'gw{i}') for i in range(nodes)]
+    for node in workers:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, workers
+
+
+def test_estimate_uses_median_for_unknown_tests():
+    history = {'a': 1.0, 'b': 3.0, 'c': 9.0}
+    assert estimate(['a', 'x', 'c', 'b'], history) == [1.0, 3.0, 9.0, 3.0]
+    assert estimate(['x', 'y'], {}) == [0.0, 0.0]
+
+
+def test_lpt_order_is_longest_first_and_stable():
+    assert lpt_order([1.0, 5.0, 1.0, 3.0]) == [1, 3, 0, 2]
+    assert lpt_order([0.0, 0.0, 0.0]) == [0, 1, 2]
+
+
+def test_nodes_take_next_longest_test_as_they_free_up():
+    collection = ['t0', 't1', 't2', 't3', 't4', 't5']
+    history = {'t0': 1, 't1': 6, 't2': 2, 't3': 5, 't4': 4, 't5': 3}
+    scheduler, (gw0, gw1) = _scheduler(history, collection)
+
+    assert [collection[i] for i in gw0.sent + gw1.sent] == ['t1', 't3', 't4', 't5']
+
+    scheduler.mark_test_complete(gw1, gw1.sent[0])
+    assert collection[gw1.sent[-1]] == 't2'
+    assert len(scheduler.node2pending[gw1]) == 2
+
+    for node in (gw0, gw1, gw1, gw0, gw0):
+        scheduler.mark_test_complete(node, scheduler.node2pending[node][0])
+
+    assert scheduler.tests_finished and not scheduler.has_pending
+    assert gw0.shutting_down and gw1.shutting_down
+
+
+def test_crashed_node_tests_are_rescheduled():
+    collection = ['t0', 't1', 't2']
+    scheduler, (gw0, gw1) = _scheduler({}, collection)
+
+    assert scheduler.remove_node(gw0) == 't0'
+    assert [collection[i] for i in gw1.sent] == ['t2', 't1']
+    assert scheduler.nodes == [gw1]
+
+
+def test_makespan_is_wall_clock_of_longest_worker():
+    reports = [
+        {'nodeid': 't0', 'worker': 'gw0', 'start_time': 100.0, 'duration': 2.0},
+        {'nodeid': 't1', 'worker': 'gw0', 'start_time': 105.0, 'duration': 1.0},
+        {'nodeid': 't2', 'worker': 'gw1', 'start_time': 100.0, 'duration': 3.0},
+    ]
+    summary = scheduling_summary(reports, ['t0', 't1', 't2'], {})
+
+    assert summary['makespan'] == 6.0
+    assert summary['busiest'] == 3.0
+    assert summary['busy'] == {'gw0': 3.0, 'gw1': 3.0}
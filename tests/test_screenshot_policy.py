@@ -0,0 +1,82 @@
+import io
+
+import pytest
+
+from b_logger.entities.attachments import Attachment
+from b_logger.utils.screenshots import ScreenshotPolicy, image_hash
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture(autouse=True)
+def attachments_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Attachment, '_root', staticmethod(lambda: tmp_path))
+
+
+def _png(color: str = 'white', dot: tuple[int, int] = None, gradient: bool = False) -> bytes:
+    image = Image.new('RGB', (200, 100), color)
+    if gradient:
+        for x in range(200):
+            image.paste((255 - x,) * 3, (x, 0, x + 1, 100))
+    if dot:
+        image.putpixel(dot, (0, 0, 0))
+    out = io.BytesIO()
+    image.save(out, 'PNG')
+    return out.getvalue()
+
+
+def test_capture_limits():
+    policy = ScreenshotPolicy(per_test=2, per_session=3)
+
+    assert [policy.acquire() for _ in range(3)] == [None, None, 'test_limit']
+
+    policy.start_test()
+    assert [policy.acquire() for _ in range(2)] == [None, 'session_limit']
+
+
+def test_near_duplicate_is_not_stored():
+    policy = ScreenshotPolicy(dedup=True)
+
+    first, png = policy.store(0, _png(), 'page')
+    duplicate, duplicate_png = policy.store(0, _png(dot=(50, 50)), 'page')
+    changed, changed_png = policy.store(0, _png(gradient=True), 'page')
+
+    assert png is not None
+    assert duplicate_png is None and duplicate.strategy == 'duplicate' and duplicate.name == first.name
+    assert changed_png is not None and changed.name != first.name
+
+
+def test_dedup_is_per_page_and_forgotten_with_the_browser():
+    policy = ScreenshotPolicy(dedup=True)
+    png = _png()
+
+    policy.store(0, png)
+    assert policy.store(1, png)[1] is not None
+    assert policy.store(1, png)[1] is None
+
+    policy.forget_pages()
+    assert policy.store(1, png)[1] is not None
+
+
+def test_byte_budget():
+    first_png, second_png = _png(), _png(gradient=True)
+    policy = ScreenshotPolicy(max_bytes=len(first_png) + len(second_png) - 1)
+
+    first, _ = policy.store(0, first_png)
+    over, over_png = policy.store(0, second_png)
+
+    assert over_png is None and over.name == first.name
+    assert policy.bytes_used == len(first_png)
+    assert policy.acquire() == 'bytes_limit'
+    assert [attachment.name for attachment in policy.skip('bytes_limit')] == [first.name]
+
+
+def test_image_hash_distance():
+    kind, plain = image_hash(_png())
+    _, dotted = image_hash(_png(dot=(50, 50)))
+    _, gradient = image_hash(_png(gradient=True))
+
+    assert kind == 'dhash'
+    assert bin(plain ^ dotted).count('1') <= 4
+    assert bin(plain ^ gradient).count('1') > 4
+    assert image_hash(b'not an image')[0] == 'exact'
@@ -0,0 +1,81 @@
+import pytest
+
+from b_logger.entities.steps import Step, StepContainer
+from b_logger.utils.steps_store import CODECS, StepsReader, StepsSegment, StepsWriter, codec
+
+
+def _container(title: str) -> StepContainer:
+    container = StepContainer()
+    container.add_step(Step(title=title))
+    return container
+
+
+def _titles(data: dict) -> list[str]:
+    return [step['title'] for step in data['setup']]
+
+
+def _write(directory, compression: str = 'none', tests: int = 3) -> tuple[StepsWriter, list[tuple[str, int]]]:
+    writer = StepsWriter('report_test', str(directory), compression)
+    records = []
+    for i in range(tests):
+        container = _container(f'step {i}')
+        records.append((container.container_id, writer.append(f'tests/test_module.py::test_{i}', container)))
+    return writer, records
+
+
+@pytest.mark.parametrize('compression', CODECS)
+def test_round_trip(tmp_path, compression):
+    if compression == 'zstd':
+        try:
+            codec('zstd')
+        except ImportError:
+            pytest.skip('no zstd module (Python 3.14+ or zstandard)')
+
+    writer, records = _write(tmp_path, compression)
+    writer.close()
+
+    with StepsSegment(writer.path) as segment:
+        index = segment.index()
+        assert [attempt_id for _, attempt_id, _ in index] == [attempt_id for attempt_id, _ in records]
+        assert [_titles(segment.read(offset)) for _, _, offset in index] == [['step 0'], ['step 1'], ['step 2']]
+
+    assert _titles(StepContainer.from_segment(writer.path, records[1][1])) == ['step 1']
+
+
+def test_reader_groups_attempts_by_test(tmp_path):
+    writer = StepsWriter('report_test', str(tmp_path))
+    attempts = []
+    for title in ('first', 'retry'):
+        container = _container(title)
+        writer.append('tests/test_module.py::test_flaky', container)
+        attempts.append(container.container_id)
+    writer.close()
+
+    with StepsReader(str(tmp_path)) as steps:
+        assert steps.tests == {'tests/test_module.py::test_flaky': attempts}
+        assert _titles(steps.get(attempts[1])) == ['retry']
+        assert steps.get('steps_unknown') is None
+
+
+def test_segment_without_footer(tmp_path):
+    """A crashed worker never calls close(), records are found by scanning"""
+    writer, records = _write(tmp_path)
+    writer._file.close()
+
+    with StepsReader(str(tmp_path)) as steps:
+        assert list(steps.attempts) == [attempt_id for attempt_id, _ in records]
+        assert _titles(steps.get(records[2][0])) == ['step 2']
+
+
+def test_torn_last_record_is_skipped(tmp_path, capsys):
+    writer, records = _write(tmp_path)
+    writer._file.close()
+
+    with open(writer.path, 'r+b') as f:
+        f.truncate(f.seek(0, 2) - 5)
+
+    with StepsReader(str(tmp_path)) as steps:
+        assert list(steps.attempts) == [attempt_id for attempt_id, _ in records[:2]]
+        assert _titles(steps.get(records[1][0])) == ['step 1']
+
+    assert 'Skipping truncated steps record' in capsys.readouterr().out